@@ -1,19 +1,94 @@
+import hashlib
+import io
+import logging
+import os
 import pandas as pd
+from applicant_schema import compact_applicant_frame
+from instrumentation import get_logger, instrumented
+from size_capped_cache import write_entry
 
-def load_loan_data(file_path: str, sheet_name: str) -> pd.DataFrame:
-    """Load dataset from Excel file."""
+logger = get_logger('loan.data')
+
+# Parsed Excel sheets are cached as uncompressed Feather files so repeat loads can be memory-mapped
+CACHE_DIR = os.environ.get('LOAN_DATA_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'loan_data'))
+CACHE_MAX_BYTES = int(os.environ.get('LOAN_DATA_CACHE_MAX_BYTES', 2 * 1024 ** 3))
+
+def _cache_key(file_path, sheet_name):
+    # Key on path, modification time, size and sheet so an edited workbook is re-parsed
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{sheet_name}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def read_excel_cached(file_path, sheet_name, cache_dir=None, max_bytes=None):
+    """Read an Excel sheet, going through the columnar cache when possible."""
+    # File-like objects (e.g. uploads) have no stable identity to key on
+    if not isinstance(file_path, (str, os.PathLike)):
+        return pd.read_excel(file_path, sheet_name=sheet_name)
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return pd.read_excel(file_path, sheet_name=sheet_name)
+
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    cache_path = os.path.join(cache_dir, _cache_key(file_path, sheet_name) + '.feather')
+
+    if os.path.exists(cache_path):
+        try:
+            df = feather.read_feather(cache_path, memory_map=True)
+            os.utime(cache_path)  # mark as recently used
+            return df
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry '{cache_path}': {e}")
+
+    df = pd.read_excel(file_path, sheet_name=sheet_name)
+    write_entry(cache_path, lambda tmp_path: feather.write_feather(df, tmp_path, compression='uncompressed'),
+                cache_dir, max_bytes)
+    return df
+
+def memory_usage_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Per-column memory (bytes, deep) of two versions of the same frame."""
+    # Columns can be swapped out (reason text for 'Reason code'), so report the union of both
+    columns = before.columns.append(after.columns.difference(before.columns, sort=False))
+    report = pd.DataFrame({
+        'before_dtype': before.dtypes.reindex(columns).astype(str),
+        'after_dtype': after.dtypes.reindex(columns).astype(str),
+        'before_bytes': before.memory_usage(index=False, deep=True).reindex(columns),
+        'after_bytes': after.memory_usage(index=False, deep=True).reindex(columns),
+    })
+    total_before = report['before_bytes'].sum()
+    total_after = report['after_bytes'].sum()
+    logger.info(report)
+    logger.info(f"Total: {total_before / 1024 ** 2:.2f} MB -> {total_after / 1024 ** 2:.2f} MB "
+                f"({total_before / max(total_after, 1):.1f}x smaller)")
+    return report
+
+@instrumented('load_loan_data', rows=len)
+def load_loan_data(file_path: str, sheet_name: str, use_cache: bool = True, compact: bool = False) -> pd.DataFrame:
+    """Load dataset from Excel file (set use_cache=False to always re-parse the workbook)."""
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-        print("Dataset loaded successfully.")
-        print(f"Dataset shape: {df.shape}")
-        print("\nFirst 5 rows of the dataset:")
-        print(df.head())
-        print("\nDataset information:")
-        df.info()
+        if use_cache:
+            df = read_excel_cached(file_path, sheet_name)
+        else:
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+        if compact:
+            compacted = compact_applicant_frame(df)
+            logger.info("\nMemory usage with compact dtypes:")
+            memory_usage_report(df, compacted)
+            df = compacted
+        logger.info("Dataset loaded successfully.")
+        logger.info(f"Dataset shape: {df.shape}")
+        # Previews format the whole frame, so only build them when DEBUG output is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\nFirst 5 rows of the dataset:")
+            logger.debug(df.head())
+            buffer = io.StringIO()
+            df.info(buf=buffer)
+            logger.debug("\nDataset information:\n" + buffer.getvalue())
         return df
     except FileNotFoundError:
-        print(f"Error: '{file_path}' not found.")
+        logger.error(f"Error: '{file_path}' not found.")
         raise
     except Exception as e:
-        print(f"An error occurred while reading the file: {e}")
+        logger.error(f"An error occurred while reading the file: {e}")
         raise
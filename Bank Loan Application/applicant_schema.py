@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from rule_engine import GENERATOR_RULES, applicant_reason_text
+
+# Compact dtypes for applicant frames, shared by Data_utils.py (loaded workbooks) and
+# Random_data_generation/financial_data_generator.py (compact=True output). Money columns
+# are whole numbers well inside int32; integer targets are only applied when the cast is lossless.
+APPLICANT_DTYPES = {
+    'Basic': 'int32',
+    'Conveyance': 'int32',
+    'HRA': 'int32',
+    'Gross Income': 'int32',
+    'Income from other sources': 'int32',
+    'Bank credit': 'int32',
+    'debit': 'int32',
+    'Years of experiance': 'int8',
+    'Existing loan amount': 'int32',
+    'Assets': 'int32',
+    'Tax Payble': 'int32',
+    'Regime': pd.CategoricalDtype(['New', 'Old']),
+    'Loan Approved status': pd.CategoricalDtype(['Approved', 'Rejected']),
+    'Reason for approval or rejected': 'category',
+    'Reason code': 'uint16',
+}
+
+REASON_TEXT = 'Reason for approval or rejected'
+
+def reason_codes_for_text(df: pd.DataFrame):
+    """GENERATOR_RULES codes that render back to every row's reason text exactly, or None.
+
+    The sentence names the Candidate ID, so it is unique per row and never interns as a category;
+    the code is recomputed from the row's own columns and only trusted if the round trip holds.
+    """
+    try:
+        rejected = (df['Loan Approved status'] == 'Rejected').to_numpy()
+        masks, values = GENERATOR_RULES.evaluate(df)
+        codes = GENERATOR_RULES.reason_codes(masks, rejected)
+        text = applicant_reason_text(df['Candidate ID'].to_numpy(dtype=object),
+                                     GENERATOR_RULES.render(codes, values, rejected), rejected)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return codes if (text == df[REASON_TEXT].to_numpy(dtype=object)).all() else None
+
+def compact_applicant_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast an applicant frame according to APPLICANT_DTYPES.
+
+    Reason text written by the generator is replaced by its 'Reason code' (see
+    reason_codes_for_text); text that does not round-trip is kept as it is.
+    """
+    df = df.copy()
+    if REASON_TEXT in df.columns and 'Reason code' not in df.columns:
+        codes = reason_codes_for_text(df)
+        if codes is not None:
+            df.insert(df.columns.get_loc(REASON_TEXT), 'Reason code', codes)
+            df = df.drop(columns=REASON_TEXT)
+    for col, dtype in APPLICANT_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype) or dtype == 'category':
+            # Only worth it when values repeat; unique reason sentences stay as strings
+            if isinstance(dtype, str) and df[col].nunique(dropna=False) > len(df) // 2:
+                continue
+            converted = df[col].astype(dtype)
+            # Values outside fixed categories would turn into NaN, so keep those columns as they are
+            if converted.isna().sum() == df[col].isna().sum():
+                df[col] = converted
+            continue
+        if df[col].isna().any():
+            continue
+        converted = df[col].astype(dtype)
+        if np.array_equal(converted.to_numpy(), df[col].to_numpy()):
+            df[col] = converted
+        else:
+            # Fractional values: float32 if it is exact, otherwise leave the column alone
+            as_float32 = df[col].astype('float32')
+            if np.array_equal(as_float32.to_numpy(), df[col].to_numpy()):
+                df[col] = as_float32
+    return df
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from module_loader import load_module, GENERATOR_DIR, PAYSLIP_DIR
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SIZES = [1_000, 5_000, 20_000]
+# History and baseline outlive the temporary datasets but are machine-specific, so they stay out of the repo
+RESULTS_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'loan_benchmarks')
+DEFAULT_HISTORY = os.path.join(RESULTS_DIR, 'history.json')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'baseline.json')
+
+def _median_time(fn, repeats, warmup=True):
+    # One untimed call first so imports and first-call caches do not land in the timings
+    if warmup:
+        fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def dataset_path(work_dir, num_records, seed):
+    """Excel workbook of num_records generated applicants, written once per (size, seed)."""
+    path = os.path.join(work_dir, f"applicants_{num_records}_{seed}.xlsx")
+    if not os.path.exists(path):
+        generator = load_module('financial_data_generator', GENERATOR_DIR)
+        df = generator.generate_financial_data(num_records, rng=np.random.default_rng(seed))
+        tmp_path = f"{path}.{os.getpid()}.tmp.xlsx"
+        df.to_excel(tmp_path, sheet_name='Loan Applicants', index=False)
+        os.replace(tmp_path, path)
+    return path
+
+def benchmark_size(num_records, seed, work_dir, repeats, single_rows=50):
+    from Data_utils import load_loan_data
+    from preproces import prepare_features
+    from train import train_model
+    from predictor import predict_and_reason, predict_and_reason_batch
+
+    path = dataset_path(work_dir, num_records, seed)
+    cache_dir = os.path.join(work_dir, 'cache')
+    results = {}
+
+    results['load_excel'] = _median_time(lambda: load_loan_data(path, 'Loan Applicants', use_cache=False), repeats)
+    # Warm the columnar cache once, then time cached loads
+    from Data_utils import read_excel_cached
+    read_excel_cached(path, 'Loan Applicants', cache_dir=cache_dir)
+    results['load_cached'] = _median_time(lambda: read_excel_cached(path, 'Loan Applicants', cache_dir=cache_dir),
+                                          repeats)
+
+    df = load_loan_data(path, 'Loan Applicants', use_cache=False)
+    results['prepare_features'] = _median_time(lambda: prepare_features(df), repeats)
+    X, y_encoded, preprocessor, label_encoder, _, _, feature_columns = prepare_features(df)
+
+    # Training dominates the run, so it gets no warm-up call
+    results['train_model'] = _median_time(lambda: train_model(X, y_encoded, preprocessor), repeats, warmup=False)
+    model, X_test, _ = train_model(X, y_encoded, preprocessor)
+
+    rows = [{col: [value] for col, value in record.items()}
+            for record in X_test.head(single_rows).to_dict('records')]
+    predict_and_reason(rows[0], model, label_encoder, feature_columns)
+    single = []
+    for row in rows:
+        start = time.perf_counter()
+        predict_and_reason(row, model, label_encoder, feature_columns)
+        single.append(time.perf_counter() - start)
+    results['predict_single_row'] = statistics.median(single)
+    results['predict_batch'] = _median_time(
+        lambda: predict_and_reason_batch(X_test, model, label_encoder, feature_columns), repeats)
+    return {f"{stage}[{num_records}]": round(seconds, 6) for stage, seconds in results.items()}
+
+def benchmark_payslip_parsing(num_docs, seed, repeats):
+    parse_payslip_text = load_module('loan', PAYSLIP_DIR).parse_payslip_text
+    corpus = load_module('parser_benchmark', PAYSLIP_DIR).make_corpus(num_docs, seed)
+
+    def parse_all():
+        for text in corpus:
+            parse_payslip_text(text)
+    return {f"parse_payslips[{num_docs}]": round(_median_time(parse_all, repeats), 6)}
+
+def run_suite(sizes=DEFAULT_SIZES, seed=42, repeats=3, payslip_docs=5_000, work_dir=None):
+    """Time every stage at every size and return one run record (stage name -> seconds)."""
+    from instrumentation import set_log_level
+    set_log_level('WARNING')  # keep dataset previews and evaluation reports out of the timings
+    work_dir = work_dir or os.path.join(tempfile.gettempdir(), 'loan_benchmarks')
+    os.makedirs(work_dir, exist_ok=True)
+
+    results = {}
+    for num_records in sizes:
+        print(f"Benchmarking {num_records:,} applicants...")
+        results.update(benchmark_size(num_records, seed, work_dir, repeats))
+    print(f"Benchmarking payslip parsing ({payslip_docs:,} documents)...")
+    results.update(benchmark_payslip_parsing(payslip_docs, seed, repeats))
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeats': repeats,
+        'results': results,
+    }
+
+def append_history(run, history_path):
+    history = []
+    if os.path.exists(history_path):
+        with open(history_path) as f:
+            history = json.load(f)
+    history.append(run)
+    os.makedirs(os.path.dirname(os.path.abspath(history_path)), exist_ok=True)
+    with open(history_path, 'w') as f:
+        json.dump(history, f, indent=2)
+
+def compare_to_baseline(run, baseline, threshold=0.25, min_seconds=0.01):
+    """Return (rows, regressions): one row per stage in both runs, and the stages that got slower
+    by more than threshold (a fraction). Stages faster than min_seconds in both runs are noise
+    and never fail."""
+    rows, regressions = [], []
+    for stage, seconds in run['results'].items():
+        base = baseline['results'].get(stage)
+        if base is None:
+            continue
+        change = (seconds - base) / base if base > 0 else 0.0
+        regressed = change > threshold and max(seconds, base) >= min_seconds
+        rows.append((stage, base, seconds, change, regressed))
+        if regressed:
+            regressions.append(stage)
+    return rows, regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fixed-seed performance benchmarks with regression gating")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--payslip-docs', type=int, default=5_000)
+    parser.add_argument('--work-dir', default=None, help="where generated datasets are kept between runs")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="JSON file every run is appended to")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown per stage, e.g. 0.25 = 25%%")
+    parser.add_argument('--min-seconds', type=float, default=0.01, help="stages faster than this never fail")
+    args = parser.parse_args()
+
+    run = run_suite(args.sizes, args.seed, args.repeats, args.payslip_docs, args.work_dir)
+    append_history(run, args.history)
+    print(f"\nRun appended to '{args.history}'")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline saved to '{args.baseline}'")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows, regressions = compare_to_baseline(run, baseline, args.threshold, args.min_seconds)
+        print(f"\nCompared with baseline from {baseline['timestamp']} (commit {baseline.get('commit')}):")
+        for stage, base, seconds, change, regressed in rows:
+            print(f"  {stage:<32} {base * 1000:>10.2f} ms -> {seconds * 1000:>10.2f} ms  {change:+7.1%}"
+                  f"{'  REGRESSION' if regressed else ''}")
+        if regressions:
+            sys.exit(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}: "
+                     f"{', '.join(regressions)}")
+        print("\nNo regressions.")
+    else:
+        print(f"No baseline at '{args.baseline}'; run with --save-baseline to create one")
+        for stage, seconds in run['results'].items():
+            print(f"  {stage:<32} {seconds * 1000:>10.2f} ms")
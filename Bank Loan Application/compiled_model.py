@@ -0,0 +1,226 @@
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+
+_INT64_MIN = np.int64(np.iinfo(np.int64).min)
+
+def _float_to_key(values):
+    # Map float64 values to int64 keys with the same ordering, so we can bisect over doubles
+    bits = values.view(np.int64)
+    return np.where(bits >= 0, bits, _INT64_MIN - bits)
+
+def _key_to_float(keys):
+    bits = np.where(keys >= 0, keys, _INT64_MIN - keys)
+    return bits.astype(np.int64).view(np.float64)
+
+def _fold_scaler_thresholds(thresholds, mean, scale):
+    """Return raw-space thresholds T with  x <= T  <=>  float32((x - mean) / scale) <= threshold.
+
+    Trees compare float32-cast scaled values, so t * scale + mean is only approximately the
+    boundary; we bisect over float64 bit patterns to find the exact last raw value going left.
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    mean = np.asarray(mean, dtype=np.float64)
+    scale = np.asarray(scale, dtype=np.float64)
+
+    def goes_left(x):
+        return ((x - mean) / scale).astype(np.float32) <= thresholds
+
+    estimate = thresholds * scale + mean
+    width = np.abs(estimate) * 1e-5 + scale * 1e-5 + 1e-9
+    lo = estimate - width
+    hi = estimate + width
+    # Widen the bracket until lo goes left and hi goes right
+    for _ in range(64):
+        bad_lo = ~goes_left(lo)
+        bad_hi = goes_left(hi)
+        if not (bad_lo.any() or bad_hi.any()):
+            break
+        width = width * 4
+        lo = np.where(bad_lo, estimate - width, lo)
+        hi = np.where(bad_hi, estimate + width, hi)
+
+    lo_key = _float_to_key(lo)
+    hi_key = _float_to_key(hi)
+    while True:
+        open_gap = hi_key - lo_key > 1
+        if not open_gap.any():
+            break
+        mid_key = lo_key + (hi_key - lo_key) // 2
+        left = goes_left(_key_to_float(mid_key))
+        lo_key = np.where(open_gap & left, mid_key, lo_key)
+        hi_key = np.where(open_gap & ~left, mid_key, hi_key)
+    return _key_to_float(lo_key)
+
+class CompiledForest:
+    """RandomForest pipeline flattened into contiguous node arrays with preprocessing folded in."""
+
+    def __init__(self, numerical_features, categorical_features, categories, classes,
+                 left, right, feature, threshold, leaf_proba, roots, depth):
+        self.numerical_features = list(numerical_features)
+        self.categorical_features = list(categorical_features)
+        self.categories = [list(c) for c in categories]
+        self.classes_ = np.asarray(classes)
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.depth = int(depth)
+        self.feature_names_in_ = np.array(self.numerical_features + self.categorical_features, dtype=object)
+
+    def _input_matrix(self, X):
+        # Raw numeric values followed by one-hot indicators, in ColumnTransformer output order
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(X)
+        n_cat_cols = sum(len(c) for c in self.categories)
+        matrix = np.empty((len(X), len(self.numerical_features) + n_cat_cols), dtype=np.float64)
+        if self.numerical_features:
+            matrix[:, :len(self.numerical_features)] = X[self.numerical_features].to_numpy(dtype=np.float64)
+        col = len(self.numerical_features)
+        for name, cats in zip(self.categorical_features, self.categories):
+            values = X[name].to_numpy(dtype=object)
+            for cat in cats:
+                matrix[:, col] = values == cat  # unknown categories leave every indicator at 0
+                col += 1
+        return matrix
+
+    def predict_proba(self, X):
+        matrix = self._input_matrix(X)
+        rows = np.arange(len(matrix))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(matrix), len(self.roots))).copy()
+        # Leaves point at themselves, so walking max-depth steps lands every tree on its leaf
+        for _ in range(self.depth):
+            go_left = matrix[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        per_tree = self.leaf_proba[nodes]
+        # Accumulate tree by tree in estimator order, as RandomForestClassifier does
+        proba = np.zeros((len(matrix), per_tree.shape[2]), dtype=np.float64)
+        for t in range(per_tree.shape[1]):
+            proba += per_tree[:, t]
+        return proba / per_tree.shape[1]
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def save(self, path):
+        meta = {
+            'numerical_features': self.numerical_features,
+            'categorical_features': self.categorical_features,
+            'categories': self.categories,
+            'classes': self.classes_.tolist(),
+            'depth': self.depth,
+        }
+        np.savez(path, left=self.left, right=self.right, feature=self.feature, threshold=self.threshold,
+                 leaf_proba=self.leaf_proba, roots=self.roots, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(meta['numerical_features'], meta['categorical_features'], meta['categories'],
+                       meta['classes'], data['left'], data['right'], data['feature'], data['threshold'],
+                       data['leaf_proba'], data['roots'], meta['depth'])
+
+def compile_pipeline(model):
+    """Build a CompiledForest from the Pipeline returned by train.train_model."""
+    preprocessor = model.named_steps['preprocessor']
+    forest = model.named_steps['classifier']
+
+    numerical_features, categorical_features, categories = [], [], []
+    means, scales = [], []
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == 'drop' or len(columns) == 0:
+            continue
+        if name == 'num':
+            numerical_features.extend(columns)
+            n = len(columns)
+            means.extend(transformer.mean_ if transformer.mean_ is not None else np.zeros(n))
+            scales.extend(transformer.scale_ if transformer.scale_ is not None else np.ones(n))
+        elif name == 'cat':
+            if transformer.drop is not None:
+                raise ValueError("OneHotEncoder with drop is not supported")
+            categorical_features.extend(columns)
+            categories.extend(transformer.categories_)
+        else:
+            raise ValueError(f"Unsupported transformer in preprocessor: {name}")
+    means = np.asarray(means, dtype=np.float64)
+    scales = np.asarray(scales, dtype=np.float64)
+    n_num = len(numerical_features)
+
+    lefts, rights, features, thresholds, probas, roots = [], [], [], [], [], []
+    offset = 0
+    depth = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        left = np.where(is_leaf, node_ids, tree.children_left) + offset
+        right = np.where(is_leaf, node_ids, tree.children_right) + offset
+        feature = np.where(is_leaf, 0, tree.feature)
+        threshold = np.where(is_leaf, np.inf, tree.threshold)
+
+        # Fold StandardScaler into numeric splits; one-hot splits keep their 0.5 threshold
+        numeric = ~is_leaf & (feature < n_num)
+        if numeric.any():
+            f = feature[numeric]
+            threshold[numeric] = _fold_scaler_thresholds(threshold[numeric], means[f], scales[f])
+
+        value = tree.value[:, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0] = 1.0
+        lefts.append(left)
+        rights.append(right)
+        features.append(feature)
+        thresholds.append(threshold)
+        probas.append(value / normalizer)
+        roots.append(offset)
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+
+    return CompiledForest(
+        numerical_features, categorical_features, categories, forest.classes_,
+        np.concatenate(lefts).astype(np.int32), np.concatenate(rights).astype(np.int32),
+        np.concatenate(features).astype(np.int32), np.concatenate(thresholds),
+        np.concatenate(probas), np.asarray(roots, dtype=np.int32), depth,
+    )
+
+def verify_compiled_model(compiled, model, X):
+    """Compare compiled predictions with the original pipeline; returns the mismatch count."""
+    expected = model.predict(X)
+    actual = compiled.predict(X)
+    mismatches = int((expected != actual).sum())
+    print(f"Verified {len(X)} rows: {mismatches} mismatches")
+    return mismatches
+
+def _time_single_row(predict, row, repeats=200):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(row)
+    return (time.perf_counter() - start) / repeats * 1000
+
+if __name__ == "__main__":
+    import joblib
+    parser = argparse.ArgumentParser(description="Export a trained pipeline to flat node arrays")
+    parser.add_argument('model_file', help="joblib pickle of the trained Pipeline")
+    parser.add_argument('output_file', help="destination .npz file")
+    parser.add_argument('--verify', metavar='EXCEL', help="workbook whose rows are used to check predictions")
+    parser.add_argument('--sheet', default='Loan Applicants')
+    args = parser.parse_args()
+
+    model = joblib.load(args.model_file)
+    compiled = compile_pipeline(model)
+    compiled.save(args.output_file)
+    print(f"Compiled {len(compiled.roots)} trees ({len(compiled.left)} nodes) to '{args.output_file}'")
+
+    if args.verify:
+        from Data_utils import read_excel_cached
+        X = read_excel_cached(args.verify, args.sheet)[list(model.feature_names_in_)]
+        if verify_compiled_model(compiled, model, X):
+            raise SystemExit("Compiled model does not match the original pipeline")
+        row = X.iloc[:1]
+        print(f"Single-row latency: pipeline {_time_single_row(model.predict, row):.3f} ms, "
+              f"compiled {_time_single_row(compiled.predict, row):.3f} ms")
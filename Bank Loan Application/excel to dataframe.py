@@ -1,29 +1,99 @@
+import os
+from collections import OrderedDict
 import pandas as pd
+from Data_utils import read_excel_cached
+from instrumentation import get_logger
 
-def extract_row_as_dict(file_path, sheet_name, row_index, columns):
-    # Load Excel file
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
+logger = get_logger('loan.data')
 
-    print("Columns in DataFrame:", df.columns.tolist())
-    print("Columns requested:", columns)
+# Parsed workbooks kept per cache by open_workbook; one, so a cache never holds more than the
+# sheet in use. Callers serving several users (streamlit_app.py) pass a cache of their own per session
+MAX_OPEN_WORKBOOKS = 1
+_open_workbooks = OrderedDict()
 
-    # Check columns exist in df
-    missing_cols = [col for col in columns if col not in df.columns]
-    if missing_cols:
-        raise ValueError(f"Columns missing in the sheet: {missing_cols}")
+class WorkbookReader:
+    """A sheet parsed once, with lookups by row index or Candidate ID."""
 
-    row = df.loc[row_index, columns]
+    def __init__(self, file_path, sheet_name, id_column='Candidate ID'):
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.id_column = id_column
+        if hasattr(file_path, 'seek'):
+            file_path.seek(0)
+        self.df = read_excel_cached(file_path, sheet_name)
+        self._id_index = None
 
-    # Convert each value from possible numpy types to native Python types
-    feature_dict = {}
-    for col in columns:
-        val = row[col]
-        # Convert numpy scalar to Python native type using item()
-        if hasattr(val, 'item'):
-            val = val.item()  # converts np.int64, np.float64, etc. to int, float
-        feature_dict[col] = [val]
-    return feature_dict
+    def __len__(self):
+        return len(self.df)
 
+    def check_columns(self, columns):
+        missing_cols = [col for col in columns if col not in self.df.columns]
+        if missing_cols:
+            raise ValueError(f"Columns missing in the sheet: {missing_cols}")
 
-# Example usage:
+    def _positions_for_ids(self, candidate_ids):
+        # Build the Candidate ID -> row position index on first use
+        if self._id_index is None:
+            self.check_columns([self.id_column])
+            self._id_index = pd.Index(self.df[self.id_column])
+        positions = self._id_index.get_indexer(candidate_ids)
+        missing = [cid for cid, pos in zip(candidate_ids, positions) if pos < 0]
+        if missing:
+            raise KeyError(f"Candidate IDs not found in the sheet: {missing}")
+        return positions
+
+    def rows(self, row_indices, columns):
+        # to_dict converts numpy scalars to native Python types for the whole block at once
+        self.check_columns(columns)
+        return self.df.loc[list(row_indices), columns].to_dict('records')
+
+    def row(self, row_index, columns):
+        return self.rows([row_index], columns)[0]
+
+    def rows_by_id(self, candidate_ids, columns):
+        self.check_columns(columns)
+        positions = self._positions_for_ids(list(candidate_ids))
+        return self.df.iloc[positions][columns].to_dict('records')
+
+    def row_by_id(self, candidate_id, columns):
+        return self.rows_by_id([candidate_id], columns)[0]
+
+def open_workbook(file_path, sheet_name, cache=None):
+    # Reuse a recently opened workbook; paths are keyed on mtime/size so edits are picked up
+    if cache is None:
+        cache = _open_workbooks
+    if isinstance(file_path, (str, os.PathLike)):
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), sheet_name, stat.st_mtime_ns, stat.st_size)
+    elif getattr(file_path, 'file_id', None) is not None:
+        # Streamlit uploads carry a stable file_id
+        key = (file_path.file_id, sheet_name)
+    else:
+        return WorkbookReader(file_path, sheet_name)
+
+    reader = cache.get(key)
+    if reader is not None:
+        cache.move_to_end(key)
+        return reader
 
+    # Evict before parsing so the old and new sheet are never held together
+    while len(cache) >= MAX_OPEN_WORKBOOKS:
+        cache.popitem(last=False)
+    reader = WorkbookReader(file_path, sheet_name)
+    cache[key] = reader
+    return reader
+
+def extract_row_as_dict(file_path, sheet_name, row_index, columns, cache=None):
+    reader = open_workbook(file_path, sheet_name, cache)
+
+    logger.debug("Columns in DataFrame: %s", reader.df.columns)
+    logger.debug("Columns requested: %s", columns)
+
+    # One-element lists so the result can be passed straight to pd.DataFrame
+    return {col: [val] for col, val in reader.row(row_index, columns).items()}
+
+def extract_rows_as_dicts(file_path, sheet_name, row_indices, columns, cache=None):
+    return open_workbook(file_path, sheet_name, cache).rows(row_indices, columns)
+
+
+# Example usage:
@@ -0,0 +1,213 @@
+import argparse
+import cProfile
+import functools
+import json
+import logging
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Unix only; on Windows the RSS figures are reported as None
+    resource = None
+
+# Verbose output (DataFrame previews, column dumps) is logged at DEBUG and hidden by default
+LOG_LEVEL = os.environ.get('LOAN_LOG_LEVEL', 'INFO').upper()
+
+_stats = {}
+_lock = threading.Lock()
+_traced_peaks = threading.local()
+
+def get_logger(name='loan'):
+    logger = logging.getLogger(name)
+    root = logging.getLogger('loan')
+    if not root.handlers:
+        # Plain messages on stdout, so INFO output reads like the print calls it replaced
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+    return logger
+
+def set_log_level(level):
+    get_logger().setLevel(level.upper() if isinstance(level, str) else level)
+
+def process_peak_rss_mb():
+    """Highest RSS of this process since it started, in MB, or None where resource is missing.
+
+    This is a process-lifetime peak, not the peak of any one stage or block.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+def add_count(stage, name, value=1):
+    with _lock:
+        counters = _stats.setdefault(stage, _new_stage())['counters']
+        counters[name] = counters.get(name, 0) + value
+
+def _new_stage():
+    return {'calls': 0, 'errors': 0, 'total_s': 0.0, 'max_s': 0.0, 'process_peak_rss_mb': None,
+            'peak_traced_mb': None, 'counters': {}}
+
+def instrumented(stage, rows=None):
+    """Time every call of the decorated function under stage and track peak memory.
+
+    rows, if given, maps the return value to a row count added to the stage's 'rows' counter.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracing = tracemalloc.is_tracing()
+            if tracing:
+                # reset_peak is global, so each active stage carries the peak it saw before a
+                # nested stage reset it, and nested stages pass their peak up on exit
+                stack = getattr(_traced_peaks, 'stack', None)
+                if stack is None:
+                    stack = _traced_peaks.stack = []
+                if stack:
+                    stack[-1] = max(stack[-1], tracemalloc.get_traced_memory()[1])
+                stack.append(0)
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                traced_peak = None
+                if tracing:
+                    traced_peak = max(stack.pop(), tracemalloc.get_traced_memory()[1])
+                    if stack:
+                        stack[-1] = max(stack[-1], traced_peak)
+                with _lock:
+                    entry = _stats.setdefault(stage, _new_stage())
+                    entry['calls'] += 1
+                    entry['errors'] += failed
+                    entry['total_s'] += elapsed
+                    entry['max_s'] = max(entry['max_s'], elapsed)
+                    # Process-lifetime peak at the end of the call; earlier stages can own the maximum
+                    rss = process_peak_rss_mb()
+                    if rss is not None:
+                        entry['process_peak_rss_mb'] = max(entry['process_peak_rss_mb'] or 0.0, rss)
+                    if traced_peak is not None:
+                        entry['peak_traced_mb'] = max(entry['peak_traced_mb'] or 0.0, traced_peak / 1024 ** 2)
+                    if rows is not None and not failed:
+                        entry['counters']['rows'] = entry['counters'].get('rows', 0) + int(rows(result))
+        return wrapper
+    return decorator
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
+
+def stage_report():
+    """Per-stage timings, counters and memory as a JSON-serialisable dict."""
+    with _lock:
+        stages = {}
+        for name, entry in _stats.items():
+            stages[name] = dict(entry, counters=dict(entry['counters']),
+                                mean_s=entry['total_s'] / entry['calls'] if entry['calls'] else 0.0)
+            for key in ('total_s', 'max_s', 'mean_s'):
+                stages[name][key] = round(stages[name][key], 6)
+            for key in ('process_peak_rss_mb', 'peak_traced_mb'):
+                if stages[name][key] is not None:
+                    stages[name][key] = round(stages[name][key], 2)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'stages': stages,
+    }
+
+def write_report(path):
+    with open(path, 'w') as f:
+        json.dump(stage_report(), f, indent=2, sort_keys=True)
+
+@contextmanager
+def capture(output_prefix, top=25):
+    """Opt-in profiling: cProfile and tracemalloc for everything run inside the block.
+
+    Writes <prefix>.prof (load with pstats or snakeviz), <prefix>.profile.txt with the
+    top functions by cumulative time and <prefix>.alloc.txt with the top allocation sites.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+
+        profiler.dump_stats(f"{output_prefix}.prof")
+        with open(f"{output_prefix}.profile.txt", 'w') as f:
+            pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(top)
+        with open(f"{output_prefix}.alloc.txt", 'w') as f:
+            for stat in snapshot.statistics('lineno')[:top]:
+                f.write(f"{stat}\n")
+        get_logger().info(f"Profile written to '{output_prefix}.prof', '{output_prefix}.profile.txt' "
+                          f"and '{output_prefix}.alloc.txt'")
+
+def run_instrumented_pipeline(file_path, sheet_name, predictions=100):
+    """Load, prepare, train, evaluate and predict once each, returning the stage report."""
+    from Data_utils import load_loan_data
+    from preproces import prepare_features
+    from train import train_model, evaluate_model
+    from predictor import predict_and_reason
+
+    df = load_loan_data(file_path, sheet_name)
+    X, y_encoded, preprocessor, label_encoder, _, _, feature_columns = prepare_features(df)
+    model, X_test, y_test = train_model(X, y_encoded, preprocessor)
+    evaluate_model(model, X_test, y_test, label_encoder)
+    for record in X_test.head(predictions).to_dict('records'):
+        predict_and_reason({col: [value] for col, value in record.items()}, model, label_encoder, feature_columns)
+    return stage_report()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run load/prepare/train/evaluate/predict with per-stage metrics")
+    parser.add_argument('data_file', help="Excel workbook of applicants")
+    parser.add_argument('--sheet', default='Loan Applicants')
+    parser.add_argument('--predictions', type=int, default=100, help="single-row predictions to time")
+    parser.add_argument('--report', default='stage_report.json', help="where to write the JSON report")
+    parser.add_argument('--profile', metavar='PREFIX', help="also capture cProfile and tracemalloc output")
+    parser.add_argument('--log-level', default=None, help="DEBUG shows DataFrame previews")
+    args = parser.parse_args()
+
+    if args.log_level:
+        set_log_level(args.log_level)
+    if args.profile:
+        # Import the pipeline modules first so library imports stay out of the profile
+        import Data_utils, preproces, train, predictor  # noqa: F401
+        with capture(args.profile):
+            run_instrumented_pipeline(args.data_file, args.sheet, args.predictions)
+    else:
+        run_instrumented_pipeline(args.data_file, args.sheet, args.predictions)
+    write_report(args.report)
+    for name, stage in stage_report()['stages'].items():
+        rss = stage['process_peak_rss_mb']
+        print(f"{name:<20} {stage['calls']:>5} calls  {stage['total_s']:>9.3f} s total  "
+              f"{stage['max_s'] * 1000:>9.2f} ms max  "
+              f"process peak RSS {'n/a' if rss is None else f'{rss:.0f} MB'}")
+    print(f"Report written to '{args.report}'")
+
+if __name__ == "__main__":
+    # Go through the importable module: Data_utils, train and predictor record their stages
+    # there, not in this __main__ copy
+    import instrumentation
+    instrumentation.main()
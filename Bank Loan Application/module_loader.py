@@ -0,0 +1,38 @@
+import importlib.util
+import os
+import sys
+
+# The three project folders are plain script directories, not packages. Modules are shared between
+# them by loading the file by path and registering it under its plain name, so later
+# "import rule_engine" statements get the same module object and pickling by name keeps working.
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BANK_APP_DIR = os.path.join(REPO_DIR, 'Bank Loan Application')
+GENERATOR_DIR = os.path.join(REPO_DIR, 'Random_data_generation')
+PAYSLIP_DIR = os.path.join(REPO_DIR, 'Payslip PDF-to-Structured Salary Extractor & Loan Eligibility Engine (Python)')
+
+def load_module(name, directory=BANK_APP_DIR):
+    """Import directory/<name>.py as name without adding directory to sys.path.
+
+    A module that is already imported is returned as is. Sibling modules the file imports by
+    plain name at the top (predictor -> rule_engine) are loaded from the same directory first.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    path = os.path.join(directory, f"{name}.py")
+    while True:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+            return module
+        except ModuleNotFoundError as e:
+            sys.modules.pop(name, None)
+            sibling = e.name and e.name not in sys.modules and os.path.join(directory, f"{e.name}.py")
+            if sibling and os.path.exists(sibling):
+                load_module(e.name, directory)
+                continue
+            raise
+        except BaseException:
+            sys.modules.pop(name, None)
+            raise
@@ -1,10 +1,13 @@
 import numpy as np
 from sklearn.preprocessing import LabelEncoder, StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
+from instrumentation import instrumented
 
+@instrumented('prepare_features', rows=lambda result: len(result[0]))
 def prepare_features(df, target_column='Loan Approved status'):
-    # Drop ID and reason columns from features
-    X = df.drop(columns=['Candidate ID', target_column, 'Reason for approval or rejected'])
+    # Drop ID and reason columns from features (compact frames carry 'Reason code' instead of text)
+    reason_columns = [col for col in ('Reason for approval or rejected', 'Reason code') if col in df.columns]
+    X = df.drop(columns=['Candidate ID', target_column] + reason_columns)
     y = df[target_column]
 
     # Encode target variable
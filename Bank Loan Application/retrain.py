@@ -0,0 +1,35 @@
+import argparse
+import joblib
+import pandas as pd
+from Data_utils import load_loan_data
+from train import update_model
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally retrain the saved model on newly arrived applicants")
+    parser.add_argument('new_data', help="Excel workbook, CSV or Parquet file with the new rows")
+    parser.add_argument('--sheet', default='Loan Applicants')
+    parser.add_argument('--window', help="label for the data window, e.g. 2024-06-01")
+    parser.add_argument('--trees', type=int, default=20, help="number of trees to add")
+    parser.add_argument('--model', default="trained_model.pkl")
+    parser.add_argument('--encoder', default="label_encoder.pkl")
+    parser.add_argument('--target', default='Loan Approved status')
+    args = parser.parse_args()
+
+    if args.new_data.endswith('.csv'):
+        df = pd.read_csv(args.new_data)
+    elif args.new_data.endswith('.parquet'):
+        df = pd.read_parquet(args.new_data)
+    else:
+        df = load_loan_data(args.new_data, args.sheet)
+
+    model = joblib.load(args.model)
+    label_encoder = joblib.load(args.encoder)
+    X_new = df[list(model.feature_names_in_)]
+    y_new = label_encoder.transform(df[args.target])
+
+    update_model(model, X_new, y_new, n_new_trees=args.trees, data_window=args.window)
+    joblib.dump(model, args.model)
+    info = model.training_info_
+    print(f"Model version {info['version']}: {len(model.named_steps['classifier'].estimators_)} trees")
+    for window in info['windows']:
+        print(f"  {window['window']}: {window['rows']} rows, {window['trees']} trees")
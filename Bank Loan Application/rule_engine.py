@@ -0,0 +1,258 @@
+import json
+import os
+import string
+import numpy as np
+
+# Optional JSON file overriding thresholds, e.g. {"predictor": {"max_dti": 0.35}}
+RULES_FILE = os.environ.get('LOAN_RULES_FILE')
+
+_OPS = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal}
+
+def _bind_thresholds(template, thresholds):
+    # "DTI ({value:.2f}) above {max_dti:.2f}" -> "DTI ({:.2f}) above 0.40"
+    parts = []
+    for literal, field, spec, _ in string.Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        if field == 'value':
+            parts.append('{:' + spec + '}' if spec else '{}')
+        else:
+            parts.append(format(thresholds[field], spec).replace('{', '{{').replace('}', '}}'))
+    return ''.join(parts)
+
+class RuleSet:
+    """A table of reason rules, evaluated as vectorized masks over a batch of applicants.
+
+    Each rule is (code, outcome, conditions, template, value):
+      outcome     'reject' or 'approve'; the rule only explains rows with that decision
+      conditions  (metric, op, operand) clauses that must all hold; operand is a threshold or
+                  metric name, a number, or (name, factor) for a scaled threshold or metric
+      template    str.format text; {value} is the row's value metric, thresholds by name
+    A rule's position in the table is its bit in the reason code.
+    """
+
+    def __init__(self, name, metrics, rules, thresholds, separator, single_reason_text=None):
+        self.name = name
+        self.metrics = metrics
+        self.rules = rules
+        self.thresholds = dict(thresholds)
+        self.separator = separator
+        # Extra sentence for rows that ended up with exactly one reason, by outcome
+        self.single_reason_text = single_reason_text or {}
+        self.code_dtype = np.uint16 if len(rules) <= 16 else np.uint32
+        self.bits = {rule[0]: bit for bit, rule in enumerate(rules)}
+        # Thresholds are written into each template once; rendering only fills in the value
+        self._formatters = [_bind_thresholds(rule[3], self.thresholds).format for rule in rules]
+        self._reject_bits = self.code_dtype(sum(1 << bit for bit, rule in enumerate(rules) if rule[1] == 'reject'))
+
+    def with_thresholds(self, **overrides):
+        unknown = set(overrides) - set(self.thresholds)
+        if unknown:
+            raise ValueError(f"Unknown thresholds for rule set '{self.name}': {sorted(unknown)}")
+        return RuleSet(self.name, self.metrics, self.rules, {**self.thresholds, **overrides},
+                       self.separator, self.single_reason_text)
+
+    def _operand(self, operand, values):
+        if isinstance(operand, tuple):
+            name, factor = operand
+            return self._operand(name, values) * factor
+        if isinstance(operand, str):
+            return self.thresholds[operand] if operand in self.thresholds else values[operand]
+        return operand
+
+    def evaluate(self, df):
+        """Return (masks, values): one boolean row per rule, and the metric arrays."""
+        values = self.metrics(df)
+        masks = np.ones((len(self.rules), len(df)), dtype=bool)
+        for i, (_, _, conditions, _, _) in enumerate(self.rules):
+            for metric, op, operand in conditions:
+                masks[i] &= _OPS[op](values[metric], self._operand(operand, values))
+        return masks, values
+
+    def any_fired(self, masks, outcome):
+        fired = np.zeros(masks.shape[1], dtype=bool)
+        for mask, rule in zip(masks, self.rules):
+            if rule[1] == outcome:
+                fired |= mask
+        return fired
+
+    def reason_codes(self, masks, rejected):
+        """Bitmask per row of the rules that explain its decision."""
+        codes = np.zeros(masks.shape[1], dtype=self.code_dtype)
+        for bit, (mask, rule) in enumerate(zip(masks, self.rules)):
+            applies = mask & (rejected if rule[1] == 'reject' else ~rejected)
+            codes |= np.where(applies, self.code_dtype(1 << bit), self.code_dtype(0))
+        return codes
+
+    def render(self, codes, values, rejected):
+        """Reason text per row from its code; only rules that fired are ever formatted."""
+        n = len(codes)
+        # Only the rules for each row's own decision are rendered
+        codes = np.where(rejected, codes & self._reject_bits, codes & ~self._reject_bits)
+        text = np.full(n, '', dtype=object)
+        fired = np.zeros(n, dtype=np.int64)
+        for bit, (rule, fmt) in enumerate(zip(self.rules, self._formatters)):
+            idx = np.flatnonzero(codes & self.code_dtype(1 << bit))
+            if len(idx) == 0:
+                continue
+            messages = [fmt(v) for v in values[rule[4]][idx]]
+            current = text[idx]
+            text[idx] = [m if not c else c + self.separator + m for c, m in zip(current, messages)]
+            fired[idx] += 1
+        for outcome, sentence in self.single_reason_text.items():
+            idx = np.flatnonzero((fired == 1) & (rejected if outcome == 'reject' else ~rejected))
+            text[idx] = [c + self.separator + sentence for c in text[idx]]
+        return text
+
+    def explain(self, df, rejected):
+        """Reason codes for a batch (rendering is left to the caller, when text is needed)."""
+        masks, _ = self.evaluate(df)
+        return self.reason_codes(masks, rejected)
+
+    def render_df(self, df, codes, rejected):
+        return self.render(codes, self.metrics(df), rejected)
+
+    def decode(self, code):
+        # Names of the rules set in one reason code, e.g. ['HIGH_DTI', 'LOW_EXPERIENCE']
+        return [rule[0] for bit, rule in enumerate(self.rules) if int(code) & (1 << bit)]
+
+def _column(df, name):
+    return df[name].to_numpy()
+
+def generator_metrics(df):
+    # Ratios as Random_data_generation/financial_data_generator.py defines them
+    gross_income = _column(df, 'Gross Income')
+    other_income = _column(df, 'Income from other sources')
+    debit = _column(df, 'debit')
+    bank_credit = _column(df, 'Bank credit')
+    total_income = gross_income + other_income
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Zero total income counts as no debt burden; zero bank credit as spending everything
+        dti = np.where(total_income == 0, 0.0, _column(df, 'Existing loan amount') / total_income)
+        expense_ratio = np.where(bank_credit == 0, 1.0, debit / bank_credit)
+    return {
+        'gross_income': gross_income,
+        'disposable_income': total_income - _column(df, 'Tax Payble') - debit,
+        'dti': dti,
+        'expense_ratio': expense_ratio,
+        'years_experience': _column(df, 'Years of experiance'),
+        'existing_loan': _column(df, 'Existing loan amount'),
+        'assets': _column(df, 'Assets'),
+    }
+
+def predictor_metrics(df):
+    # Debt-to-income, expense ratio and disposable income per row (inf when the denominator is 0)
+    gross_income = df['Gross Income'].to_numpy(dtype=float)
+    debit = df['debit'].to_numpy(dtype=float)
+    bank_credit = df['Bank credit'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dti = np.where(gross_income > 0, df['Existing loan amount'].to_numpy(dtype=float) / gross_income, np.inf)
+        expense_ratio = np.where(bank_credit > 0, debit / bank_credit, np.inf)
+    return {
+        'gross_income': _column(df, 'Gross Income'),
+        'disposable_income': gross_income - (debit + df['Tax Payble'].to_numpy(dtype=float)),
+        'dti': dti,
+        'expense_ratio': expense_ratio,
+        'years_experience': _column(df, 'Years of experiance'),
+        'existing_loan': _column(df, 'Existing loan amount'),
+        'assets': _column(df, 'Assets'),
+    }
+
+GENERATOR_THRESHOLDS = {
+    'min_gross_income': 40000,
+    'min_disposable_income': 7000,
+    'max_dti': 0.40,
+    'max_expense_ratio': 0.75,
+    'min_years_experience': 2,
+    'high_existing_loan': 1000000,
+    'substantial_assets': 500000,  # assets above this amount are considered substantial
+}
+
+GENERATOR_RULE_TABLE = [
+    # --- REJECTION CRITERIA (Hard Stops) ---
+    ('LOW_GROSS_INCOME', 'reject', [('gross_income', '<', 'min_gross_income')],
+     "Gross income (${value:,.0f}) is below the minimum required (${min_gross_income:,.0f}).", 'gross_income'),
+    ('LOW_DISPOSABLE_INCOME', 'reject', [('disposable_income', '<', 'min_disposable_income')],
+     "Disposable income (${value:,.0f}) is insufficient, below minimum required (${min_disposable_income:,.0f}).",
+     'disposable_income'),
+    ('HIGH_DTI', 'reject', [('dti', '>', 'max_dti')],
+     "Debt-to-income ratio ({value:.2f}) exceeds maximum allowed ({max_dti:.2f}).", 'dti'),
+    ('HIGH_EXISTING_LOAN', 'reject', [('dti', '<=', 'max_dti'), ('existing_loan', '>', 'high_existing_loan')],
+     "Existing loan amount (${value:,.0f}) is exceptionally high.", 'existing_loan'),
+    ('HIGH_EXPENSE_RATIO', 'reject', [('expense_ratio', '>', 'max_expense_ratio')],
+     "Expense ratio ({value:.2f}) is too high, indicating high spending relative to income.", 'expense_ratio'),
+    ('LOW_EXPERIENCE', 'reject', [('years_experience', '<', 'min_years_experience')],
+     "Years of experience ({value}) is below the recommended minimum ({min_years_experience}).", 'years_experience'),
+    # --- APPROVAL FACTORS (only used for rows with no rejection reason) ---
+    ('GROSS_INCOME_OK', 'approve', [], "Gross Income (${value:,.0f}) meets requirements.", 'gross_income'),
+    ('DISPOSABLE_INCOME_OK', 'approve', [], "Disposable Income (${value:,.0f}) is strong.", 'disposable_income'),
+    ('DTI_OK', 'approve', [], "DTI ({value:.2f}) is healthy.", 'dti'),
+    ('EXPENSE_RATIO_OK', 'approve', [], "Expense Ratio ({value:.2f}) is favorable.", 'expense_ratio'),
+    ('EXPERIENCE_OK', 'approve', [], "Years of experience ({value}) provides stability.", 'years_experience'),
+    ('SUBSTANTIAL_ASSETS', 'approve', [('assets', '>=', 'substantial_assets')],
+     "Substantial assets (${value:,.0f}) provide additional financial strength.", 'assets'),
+    ('SOME_ASSETS', 'approve', [('assets', '<', 'substantial_assets'), ('assets', '>', 0)],
+     "Assets (${value:,.0f}) contribute to financial health.", 'assets'),
+]
+
+PREDICTOR_THRESHOLDS = {
+    'max_dti': 0.40,
+    'min_gross_income': 70000,
+    'max_existing_loan': 500000,
+    'min_assets': 100000,
+    'min_years_experience': 5,
+    'max_expense_ratio': 0.50,
+}
+
+PREDICTOR_RULE_TABLE = [
+    ('HIGH_DTI', 'reject', [('dti', '>', 'max_dti')],
+     "Debt-to-income ratio ({value:.2f}) exceeds maximum allowed ({max_dti:.2f}).\n", 'dti'),
+    ('LOW_GROSS_INCOME', 'reject', [('gross_income', '<', ('min_gross_income', 0.8))],
+     "Gross Income ({value:,.0f}) is lower than typical approval requirements.\n", 'gross_income'),
+    ('HIGH_EXISTING_LOAN', 'reject', [('existing_loan', '>', 'max_existing_loan')],
+     "Existing loan amount ({value:,.0f}) is considerably high.\n", 'existing_loan'),
+    ('LOW_ASSETS', 'reject', [('assets', '<', ('min_assets', 0.5))],
+     "Assets (${value:,.0f}) are insufficient.\n", 'assets'),
+    ('HIGH_EXPENSE_RATIO', 'reject', [('expense_ratio', '>', 'max_expense_ratio')],
+     "Expense Ratio ({value:.2f}) is unfavorable.\n", 'expense_ratio'),
+    ('GROSS_INCOME_OK', 'approve', [('gross_income', '>=', 'min_gross_income')],
+     "Gross Income ({value:,.0f}) meets requirements.\n", 'gross_income'),
+    ('DISPOSABLE_INCOME_OK', 'approve', [('disposable_income', '>', ('gross_income', 0.3))],
+     "Disposable Income ({value:,.0f}) is strong.\n", 'disposable_income'),
+    ('DTI_OK', 'approve', [('dti', '<=', 'max_dti')], "DTI ({value:.2f}) is healthy.\n", 'dti'),
+    ('EXPENSE_RATIO_OK', 'approve', [('expense_ratio', '<=', 'max_expense_ratio')],
+     "Expense Ratio ({value:.2f}) is favorable.\n", 'expense_ratio'),
+    ('EXPERIENCE_OK', 'approve', [('years_experience', '>=', 'min_years_experience')],
+     "Years of experience ({value}) provides stability.\n", 'years_experience'),
+    ('SUBSTANTIAL_ASSETS', 'approve', [('assets', '>=', 'min_assets')],
+     "Substantial assets ({value:,.0f}) provide additional financial strength.\n", 'assets'),
+    ('SOME_ASSETS', 'approve', [('assets', '<', 'min_assets'), ('assets', '>', 0)],
+     "Assets ({value:,.0f}) contribute to financial health.\n", 'assets'),
+]
+
+def applicant_reason_text(candidate_ids, reason_text, rejected):
+    # The generator's 'Reason for approval or rejected' sentence around a GENERATOR_RULES rendering
+    prefix = 'For Candidate ID ' + np.asarray(candidate_ids, dtype=object) + ': '
+    return np.where(rejected, prefix + reason_text, prefix + 'Approved. ' + reason_text)
+
+def load_thresholds(path):
+    """Read {"generator": {...}, "predictor": {...}} threshold overrides from a JSON file."""
+    with open(path) as f:
+        overrides = json.load(f)
+    unknown = set(overrides) - {'generator', 'predictor'}
+    if unknown:
+        raise ValueError(f"Unknown rule sets in '{path}': {sorted(unknown)}")
+    return overrides
+
+def build_rule_sets(overrides=None):
+    overrides = overrides or {}
+    generator = RuleSet('generator', generator_metrics, GENERATOR_RULE_TABLE, GENERATOR_THRESHOLDS, '; ')
+    predictor = RuleSet('predictor', predictor_metrics, PREDICTOR_RULE_TABLE, PREDICTOR_THRESHOLDS, ' ', {
+        'reject': "The application does not meet the general criteria for approval. Please review the financial details.\n",
+        'approve': "The application meets the general criteria for approval.\n",
+    })
+    return (generator.with_thresholds(**overrides.get('generator', {})),
+            predictor.with_thresholds(**overrides.get('predictor', {})))
+
+GENERATOR_RULES, PREDICTOR_RULES = build_rule_sets(load_thresholds(RULES_FILE) if RULES_FILE else None)
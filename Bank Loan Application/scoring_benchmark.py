@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+
+def make_applicants(n, seed=42):
+    # Random applicants covering the same ranges as the synthetic training data
+    rng = np.random.default_rng(seed)
+    applicants = []
+    for i in range(n):
+        basic = int(rng.integers(50000, 150000))
+        conveyance = round(basic * 0.07)
+        hra = round(basic * 0.4)
+        gross = basic + conveyance + hra + int(rng.integers(0, 15000))
+        other = float(round(rng.uniform(0, 50000))) if rng.random() < 0.6 else 0.0
+        credit = gross + other + int(rng.integers(1000, 5000))
+        applicants.append({
+            'Candidate ID': f'BENCH{i + 1:06d}',
+            'Basic': basic,
+            'Conveyance': float(conveyance),
+            'HRA': float(hra),
+            'Gross Income': float(gross),
+            'Income from other sources': other,
+            'Bank credit': float(credit),
+            'debit': float(round((gross + other) * rng.uniform(0.3, 0.8))),
+            'Years of experiance': int(rng.integers(0, 20)),
+            'Existing loan amount': float(round(rng.uniform(0, 1500000))) if rng.random() < 0.5 else 0.0,
+            'Assets': float(round(rng.uniform(10000, 5000000))),
+            'Regime': 'Old' if rng.random() < 0.5 else 'New',
+            'Tax Payble': float(round(gross * 0.15)),
+        })
+    return applicants
+
+async def _client(host, port, applicants, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for applicant in applicants:
+            body = json.dumps(applicant).encode('utf-8')
+            request = (f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b' 200 ' not in status_line:
+                raise RuntimeError(f"Request failed: {status_line.decode().strip()}")
+    finally:
+        writer.close()
+
+async def run_benchmark(host='127.0.0.1', port=8000, requests=2000, concurrency=32):
+    applicants = make_applicants(requests)
+    per_client = [applicants[i::concurrency] for i in range(concurrency)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, chunk, latencies) for chunk in per_client if chunk))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    report = {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency_ms_p50': round(float(np.percentile(latencies_ms, 50)), 2),
+        'latency_ms_p95': round(float(np.percentile(latencies_ms, 95)), 2),
+        'latency_ms_p99': round(float(np.percentile(latencies_ms, 99)), 2),
+        'latency_ms_max': round(float(latencies_ms.max()), 2),
+    }
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency/throughput benchmark for scoring_service.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run_benchmark(args.host, args.port, args.requests, args.concurrency)), indent=2))
@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import json
+import os
+import joblib
+from predictor import predict_and_reason_batch
+
+MODEL_FILE = "trained_model.pkl"
+ENCODER_FILE = "label_encoder.pkl"
+DEFAULT_DATASET = "D:\\Datasets\\5k_dummy_records.xlsx"
+DEFAULT_SHEET = "Loan Applicants"
+
+class MicroBatcher:
+    """Collects concurrent single-applicant requests and scores them with one model.predict call."""
+
+    def __init__(self, model, label_encoder, feature_columns, max_batch_size=64, max_wait_ms=5.0):
+        self.model = model
+        self.label_encoder = label_encoder
+        self.feature_columns = feature_columns
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.scored = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, record):
+        # Reject incomplete records up front so one bad request cannot fail a whole batch
+        missing_cols = [col for col in self.feature_columns if record.get(col) is None]
+        if missing_cols:
+            raise ValueError(f"Missing columns in input data: {missing_cols}")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block for the first request, then gather more until the batch is full or max_wait passes
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Scoring runs off the event loop so new requests keep queueing meanwhile
+            results = await loop.run_in_executor(None, self._score, [record for record, _ in batch])
+            self.batches += 1
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    self.scored += 1
+                    future.set_result(result)
+
+    def _score(self, records):
+        # One result dict or exception per record. If the batch fails, score the records one by
+        # one so a single bad request (e.g. a non-numeric value) fails alone
+        try:
+            statuses, reasons, _ = predict_and_reason_batch(records, self.model, self.label_encoder,
+                                                            self.feature_columns)
+            return [{'status': str(status), 'reason': reason} for status, reason in zip(statuses, reasons)]
+        except Exception as e:
+            if len(records) == 1:
+                return [e]
+        return [self._score([record])[0] for record in records]
+
+def load_or_train_model(model_file=MODEL_FILE, encoder_file=ENCODER_FILE):
+    # Keep the fitted Pipeline resident for the lifetime of the service
+    if os.path.exists(model_file) and os.path.exists(encoder_file):
+        model = joblib.load(model_file)
+        label_encoder = joblib.load(encoder_file)
+        feature_columns = list(model.feature_names_in_)
+    else:
+        from Data_utils import load_loan_data
+        from preproces import prepare_features
+        from train import train_model
+        print("Training model from default dataset...")
+        df = load_loan_data(DEFAULT_DATASET, DEFAULT_SHEET)
+        X, y_encoded, preprocessor, label_encoder, _, _, feature_columns = prepare_features(df)
+        model, _, _ = train_model(X, y_encoded, preprocessor)
+        joblib.dump(model, model_file)
+        joblib.dump(label_encoder, encoder_file)
+    return model, label_encoder, feature_columns
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+        raise ValueError(f"Malformed request line: {request_line[:100]!r}")
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = b''
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise ValueError(f"Invalid Content-Length: {headers['content-length']!r}") from None
+    if length < 0:
+        raise ValueError(f"Invalid Content-Length: {length}")
+    if length:
+        body = await reader.readexactly(length)
+    return method, path, headers, body
+
+def _response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode('utf-8')
+    head = (f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+def make_handler(batcher):
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as e:
+                    # The rest of the stream cannot be framed, so answer and close the connection
+                    writer.write(_response('400 Bad Request', {'error': str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                if method == 'POST' and path == '/predict':
+                    try:
+                        record = json.loads(body)
+                        if not isinstance(record, dict):
+                            raise ValueError("Request body must be a JSON object with one applicant")
+                        result = await batcher.submit(record)
+                        response = _response('200 OK', result, keep_alive)
+                    except ValueError as e:
+                        response = _response('400 Bad Request', {'error': str(e)}, keep_alive)
+                    except Exception as e:
+                        response = _response('500 Internal Server Error', {'error': str(e)}, keep_alive)
+                elif method == 'GET' and path == '/health':
+                    response = _response('200 OK', {'status': 'ok', 'batches': batcher.batches,
+                                                    'scored': batcher.scored}, keep_alive)
+                else:
+                    response = _response('404 Not Found', {'error': f"No route for {method} {path}"}, keep_alive)
+
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+async def serve(host='127.0.0.1', port=8000, max_batch_size=64, max_wait_ms=5.0):
+    model, label_encoder, feature_columns = load_or_train_model()
+    batcher = MicroBatcher(model, label_encoder, feature_columns, max_batch_size, max_wait_ms)
+    batcher.start()
+    server = await asyncio.start_server(make_handler(batcher), host, port)
+    print(f"Scoring service listening on http://{host}:{port} "
+          f"(max batch size {max_batch_size}, max wait {max_wait_ms} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP loan scoring service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.max_batch_size, args.max_wait_ms))
@@ -0,0 +1,58 @@
+import os
+from instrumentation import get_logger
+
+logger = get_logger('loan.cache')
+
+# Per cache directory: [bytes found by the last scan, bytes written since]. The directory is
+# only rescanned once writes could have pushed it past max_bytes, not on every write; other
+# processes sharing the cache are caught up with after a tenth of max_bytes has been written
+_cache_usage = {}
+
+def write_entry(path, write, cache_dir, max_bytes):
+    """Write one cache entry with write(tmp_path), publish it atomically and keep cache_dir under max_bytes.
+
+    Entries are the files under cache_dir with path's extension. A failed write is logged and
+    skipped; the caller already has the value, so only the next read pays for it.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write(tmp_path)
+        os.replace(tmp_path, path)
+        _note_cache_write(cache_dir, os.path.getsize(path), max_bytes, os.path.splitext(path)[1])
+    except Exception as e:
+        logger.warning(f"Could not write cache entry '{path}': {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _note_cache_write(cache_dir, size, max_bytes, suffix):
+    usage = _cache_usage.get(cache_dir)
+    if usage is not None:
+        usage[1] += size
+        if usage[0] + usage[1] <= max_bytes and usage[1] <= max_bytes // 10:
+            return
+    # Evicting down to 90% leaves room for the next writes before another scan is needed
+    _cache_usage[cache_dir] = [_evict_cache(cache_dir, max_bytes - max_bytes // 10, suffix), 0]
+
+def _evict_cache(cache_dir, max_bytes, suffix):
+    # Drop least recently used entries until the cache fits in max_bytes; returns the size left
+    entries = []
+    for root, _, names in os.walk(cache_dir):
+        for name in names:
+            if name.endswith(suffix):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    return total
@@ -0,0 +1,48 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from module_loader import load_module, GENERATOR_DIR
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+write_financial_data = load_module('financial_data_generator', GENERATOR_DIR).write_financial_data
+
+def run_training(data_file, in_memory=False, chunk_size=100_000):
+    # Each run gets a fresh interpreter so its peak RSS is measured in isolation
+    cmd = [sys.executable, os.path.join(HERE, 'streaming_train.py'), data_file,
+           '--chunk-size', str(chunk_size), '--report']
+    if in_memory:
+        cmd.append('--in-memory')
+    output = subprocess.run(cmd, cwd=HERE, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peak RSS of streaming vs in-memory training by row count")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--in-memory', action='store_true', help="also run the in-memory path for comparison")
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            data_file = os.path.join(tmp, f'applicants_{size}.parquet')
+            write_financial_data(data_file, size, chunk_size=args.chunk_size)
+            modes = [False, True] if args.in_memory else [False]
+            for in_memory in modes:
+                result = run_training(data_file, in_memory, args.chunk_size)
+                results.append(result)
+                peak_rss = result['process_peak_rss_mb']
+                peak_text = '     n/a' if peak_rss is None else f"{peak_rss:8.1f}"
+                print(f"{result['rows']:>12,d} rows  {result['mode']:>9}  {result['seconds']:8.1f} s  "
+                      f"accuracy {result['accuracy']:.4f} (majority {result['majority_accuracy']:.4f})  "
+                      f"peak RSS {peak_text} MB")
+            os.remove(data_file)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
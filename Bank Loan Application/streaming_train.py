@@ -0,0 +1,231 @@
+import argparse
+import json
+import math
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+from instrumentation import process_peak_rss_mb
+from train import update_model
+
+DROP_COLUMNS = ['Candidate ID', 'Reason for approval or rejected', 'Reason code']
+CATEGORICAL_FEATURES = ['Regime']
+
+def read_columns(file_path):
+    # Column names without reading any rows
+    if str(file_path).endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(file_path).schema_arrow.names
+    return pd.read_csv(file_path, nrows=0).columns.tolist()
+
+def iter_chunks(file_path, chunk_size=100_000, columns=None):
+    # Yield DataFrames of at most chunk_size rows from a CSV or Parquet file
+    if str(file_path).endswith('.parquet'):
+        import pyarrow.parquet as pq
+        # pre_buffer=False reads one column chunk at a time, keeping peak memory flat
+        parquet_file = pq.ParquetFile(file_path, pre_buffer=False)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file_path, chunksize=chunk_size, usecols=columns)
+
+def scan_dataset(file_path, target_column='Loan Approved status', chunk_size=100_000):
+    """One pass over the file: feature columns, label classes, categories and scaler statistics."""
+    scaler = StandardScaler()
+    classes = set()
+    categories = {col: set() for col in CATEGORICAL_FEATURES}
+    # ID and free-text reason columns are never read, which is most of the bytes per row
+    feature_columns = [col for col in read_columns(file_path) if col not in DROP_COLUMNS + [target_column]]
+    numerical_features = None
+    first_chunk = None
+    rows = 0
+
+    for chunk in iter_chunks(file_path, chunk_size, columns=feature_columns + [target_column]):
+        if numerical_features is None:
+            numerical_features = chunk[feature_columns].select_dtypes(include=np.number).columns.tolist()
+            first_chunk = chunk.head(1000)
+        scaler.partial_fit(chunk[numerical_features])
+        classes.update(chunk[target_column].unique())
+        for col in CATEGORICAL_FEATURES:
+            categories[col].update(chunk[col].unique())
+        rows += len(chunk)
+
+    if numerical_features is None:
+        raise ValueError(f"No rows found in '{file_path}'")
+    return {
+        'rows': rows,
+        'feature_columns': feature_columns,
+        'numerical_features': numerical_features,
+        'classes': sorted(classes),
+        'categories': [sorted(categories[col]) for col in CATEGORICAL_FEATURES],
+        'scaler': scaler,
+        'sample': first_chunk,
+    }
+
+def build_preprocessor(scan):
+    # Fit the ColumnTransformer structure on a small sample, then install the streamed statistics
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), scan['numerical_features']),
+            ('cat', OneHotEncoder(categories=scan['categories'], handle_unknown='ignore'), CATEGORICAL_FEATURES)
+        ],
+        remainder='passthrough'
+    )
+    preprocessor.fit(scan['sample'][scan['feature_columns']])
+    fitted_scaler = preprocessor.named_transformers_['num']
+    for attr in ('mean_', 'var_', 'scale_', 'n_samples_seen_'):
+        setattr(fitted_scaler, attr, getattr(scan['scaler'], attr))
+    return preprocessor
+
+def spill_shuffled(file_path, columns, chunk_size, n_buckets, holdout_fraction, bucket_dir, random_state=42):
+    """Deal every row at random to one of n_buckets Parquet files in bucket_dir, or to the holdout.
+
+    Each bucket is a sample of the whole file, so a forest grown bucket by bucket sees the same
+    mix of rows as one fitted in memory even when the file is sorted or drifts from block to block.
+    Returns the bucket paths and the held-out rows.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    rng = np.random.default_rng(random_state)
+    paths = [os.path.join(bucket_dir, f'bucket_{i}.parquet') for i in range(n_buckets)]
+    writers = [None] * n_buckets
+    schema = None
+    holdout = []
+    try:
+        for chunk in iter_chunks(file_path, chunk_size, columns=columns):
+            is_holdout = rng.random(len(chunk)) < holdout_fraction
+            holdout.append(chunk[is_holdout])
+            chunk = chunk[~is_holdout]
+            # Sort the chunk by bucket so each bucket's rows are one slice of the table
+            buckets = rng.integers(0, n_buckets, len(chunk))
+            order = np.argsort(buckets, kind='stable')
+            bounds = np.searchsorted(buckets[order], np.arange(n_buckets + 1))
+            table = pa.Table.from_pandas(chunk.iloc[order], preserve_index=False)
+            # CSV chunks can infer different dtypes; every bucket keeps the first chunk's schema
+            schema = schema or table.schema
+            table = table.cast(schema)
+            for i in range(n_buckets):
+                if bounds[i] == bounds[i + 1]:
+                    continue
+                if writers[i] is None:
+                    writers[i] = pq.ParquetWriter(paths[i], schema)
+                writers[i].write_table(table.slice(bounds[i], bounds[i + 1] - bounds[i]))
+    finally:
+        for writer in writers:
+            if writer is not None:
+                writer.close()
+    return [path for path, writer in zip(paths, writers) if writer is not None], pd.concat(holdout, ignore_index=True)
+
+def train_streaming(file_path, target_column='Loan Approved status', chunk_size=100_000,
+                    n_estimators=100, holdout_rows=20_000, random_state=42):
+    """Train a random forest on a CSV/Parquet file larger than memory, one chunk at a time.
+
+    Rows are shuffled into chunk-sized buckets on disk (spill_shuffled) and each bucket adds its
+    share of the n_estimators trees, fitted on that bucket only (warm start, see update_model), so
+    memory holds one chunk plus the forest. Up to holdout_rows rows, at most 20% like
+    train_model's test split, are held out for evaluation.
+
+    Returns (model, label_encoder, numerical_features, categorical_features, feature_columns,
+    X_holdout, y_holdout), mirroring prepare_features/train_model so the model works with
+    predict_and_reason.
+    """
+    scan = scan_dataset(file_path, target_column, chunk_size)
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.array(scan['classes'], dtype=object)
+    preprocessor = build_preprocessor(scan)
+    n_buckets = math.ceil(scan['rows'] / chunk_size)
+    trees_per_bucket = max(1, round(n_estimators / n_buckets))
+    columns = scan['feature_columns'] + [target_column]
+
+    model = None
+    pending = None
+    with tempfile.TemporaryDirectory() as bucket_dir:
+        bucket_paths, holdout = spill_shuffled(file_path, columns, chunk_size, n_buckets,
+                                               min(0.2, holdout_rows / scan['rows']), bucket_dir, random_state)
+        for i, path in enumerate(bucket_paths):
+            bucket = pd.read_parquet(path)
+            if pending is not None:
+                bucket = pd.concat([pending, bucket], ignore_index=True)
+                pending = None
+            X = bucket[scan['feature_columns']]
+            y = label_encoder.transform(bucket[target_column])
+            if len(np.unique(y)) < len(label_encoder.classes_):
+                # Every tree needs every class, so a bucket missing one is merged into the next
+                pending = bucket
+                continue
+            window = f"{file_path}[bucket {i + 1}/{len(bucket_paths)}]"
+            if model is None:
+                # The scaler already holds whole-file statistics from the scan, so only the forest is fitted
+                classifier = RandomForestClassifier(n_estimators=trees_per_bucket, random_state=random_state)
+                classifier.fit(preprocessor.transform(X), y)
+                model = Pipeline([('preprocessor', preprocessor), ('classifier', classifier)])
+                model.training_info_ = {'version': 1,
+                                        'windows': [{'window': window, 'rows': len(X), 'trees': trees_per_bucket}]}
+            else:
+                update_model(model, X, y, n_new_trees=trees_per_bucket, data_window=window, refresh_scaler=False)
+
+    if model is None:
+        raise ValueError(f"'{file_path}' needs rows of every class {list(label_encoder.classes_)} to train on")
+    if pending is not None:
+        print(f"Warning: last {len(pending)} rows hold a single class and were not trained on")
+
+    X_holdout = holdout[scan['feature_columns']]
+    y_holdout = label_encoder.transform(holdout[target_column])
+    return (model, label_encoder, scan['numerical_features'], CATEGORICAL_FEATURES, scan['feature_columns'],
+            X_holdout, y_holdout)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Out-of-core training from CSV/Parquet")
+    parser.add_argument('data_file')
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--trees', type=int, default=100,
+                        help="forest size, spread evenly over the chunks (train_model's default is 100)")
+    parser.add_argument('--output', help="where to save the model with joblib, e.g. trained_model.pkl")
+    parser.add_argument('--encoder-output', help="where to save the label encoder "
+                                                 "(default: label_encoder.pkl next to --output)")
+    parser.add_argument('--in-memory', action='store_true',
+                        help="load the whole file and use prepare_features/train_model instead (for comparison)")
+    parser.add_argument('--report', action='store_true',
+                        help="print a JSON line with time, held-out accuracy and peak RSS")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.in_memory:
+        from preproces import prepare_features
+        from train import train_model
+        df = pd.read_parquet(args.data_file) if args.data_file.endswith('.parquet') else pd.read_csv(args.data_file)
+        X, y_encoded, preprocessor, label_encoder, _, _, _ = prepare_features(df)
+        del df
+        model, X_test, y_test = train_model(X, y_encoded, preprocessor, classifier_params={'n_estimators': args.trees})
+        rows = len(X)
+    else:
+        model, label_encoder, _, _, _, X_test, y_test = train_streaming(args.data_file, chunk_size=args.chunk_size,
+                                                                        n_estimators=args.trees)
+        rows = sum(window['rows'] for window in model.training_info_['windows']) + len(X_test)
+    elapsed = time.perf_counter() - start
+    # Held-out accuracy next to always predicting the most common class
+    accuracy = float(np.mean(model.predict(X_test) == y_test))
+    majority_accuracy = float(np.bincount(y_test).max() / len(y_test))
+    peak_rss = process_peak_rss_mb()
+
+    if args.output:
+        # Saved as the pair streamlit_app.py and scoring_service.py load
+        import joblib
+        encoder_output = args.encoder_output or os.path.join(os.path.dirname(args.output), 'label_encoder.pkl')
+        joblib.dump(model, args.output)
+        joblib.dump(label_encoder, encoder_output)
+    if args.report:
+        # Each run is its own process, so the process peak is the peak of this training run
+        print(json.dumps({'rows': rows, 'mode': 'in-memory' if args.in_memory else 'streaming',
+                          'seconds': round(elapsed, 3), 'accuracy': round(accuracy, 4),
+                          'majority_accuracy': round(majority_accuracy, 4),
+                          'process_peak_rss_mb': None if peak_rss is None else round(peak_rss, 1)}))
+    else:
+        peak_text = 'n/a' if peak_rss is None else f"{peak_rss:.0f} MB"
+        print(f"Trained on {rows} rows in {elapsed:.1f} s; held-out accuracy {accuracy:.4f} "
+              f"(majority class {majority_accuracy:.4f}); process peak RSS {peak_text}")
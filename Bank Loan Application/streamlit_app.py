@@ -1,53 +1,198 @@
 import streamlit as st
 import pandas as pd
 import joblib
-from predictor import predict_and_reason
-from from_excel import extract_row_as_dict
+from predictor import predict_and_reason, score_in_batches
+from from_excel import extract_row_as_dict, open_workbook
 from data_utils import load_loan_data
 from preprocessing import prepare_features
 from train import train_model
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import os
+import shutil
+import tempfile
+
+MODEL_FILE = "trained_model.pkl"
+ENCODER_FILE = "label_encoder.pkl"
+DEFAULT_DATASET = "D:\\Datasets\\5k_dummy_records.xlsx"
+DEFAULT_SHEET = "Loan Applicants"
+BULK_BATCH_SIZE = 10000
+
+def artifact_signature():
+    # (mtime, size) of both artifacts, or None while either is missing
+    if not (os.path.exists(MODEL_FILE) and os.path.exists(ENCODER_FILE)):
+        return None
+    return tuple((os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in (MODEL_FILE, ENCODER_FILE))
+
+@st.cache_resource(max_entries=1)
+def load_model_artifacts(signature):
+    # Loaded once per process; a new signature (files rewritten on disk) forces a reload
+    return joblib.load(MODEL_FILE), joblib.load(ENCODER_FILE)
+
+@st.cache_resource
+def get_training_job():
+    # Shared across sessions and reruns so only one cold-start training runs per process
+    return {'executor': ThreadPoolExecutor(max_workers=1), 'future': None,
+            'stage': '', 'progress': 0.0, 'lock': threading.Lock()}
+
+def _train_default_model(job):
+    job['stage'], job['progress'] = "Loading default dataset...", 0.1
+    df = load_loan_data(DEFAULT_DATASET, DEFAULT_SHEET)
+    job['stage'], job['progress'] = "Preparing features...", 0.3
+    X, y_encoded, preprocessor, label_encoder, num_cols, cat_cols, feature_cols = prepare_features(df)
+    job['stage'], job['progress'] = "Training model...", 0.5
+    model, _, _ = train_model(X, y_encoded, preprocessor)
+    job['stage'], job['progress'] = "Saving model...", 0.9
+    # Write to temporary files first so a reader never sees a half-written artifact
+    joblib.dump(model, MODEL_FILE + ".tmp")
+    joblib.dump(label_encoder, ENCODER_FILE + ".tmp")
+    os.replace(ENCODER_FILE + ".tmp", ENCODER_FILE)
+    os.replace(MODEL_FILE + ".tmp", MODEL_FILE)
+    job['stage'], job['progress'] = "Done", 1.0
+
+def score_sheet_to_files(applicants, model, label_encoder, feature_columns, progress):
+    # Each scored batch is appended to CSV (and Parquet when pyarrow is installed) in a new temporary
+    # directory, so memory holds one batch; only the status counts, a preview and the paths are returned
+    output_dir = tempfile.mkdtemp(prefix="loan_predictions_")
+    csv_path = os.path.join(output_dir, "loan_predictions.csv")
+    parquet_path = os.path.join(output_dir, "loan_predictions.parquet")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        pq = parquet_path = None
+    parquet_writer = None
+    counts = pd.Series(dtype='int64')
+    preview = None
+    try:
+        for done, batch_result in score_in_batches(applicants, model, label_encoder,
+                                                   feature_columns, BULK_BATCH_SIZE):
+            batch_result.to_csv(csv_path, mode='w' if preview is None else 'a', header=preview is None, index=False)
+            if pq is not None:
+                table = pa.Table.from_pandas(batch_result, preserve_index=False)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(parquet_path, table.schema)
+                parquet_writer.write_table(table.cast(parquet_writer.schema))
+            counts = counts.add(batch_result['Loan Status'].value_counts(), fill_value=0)
+            if preview is None:
+                preview = batch_result.head(100)
+            progress.progress(done / len(applicants), text=f"Scored {done:,} of {len(applicants):,} rows")
+    except BaseException:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        raise
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    if preview is None:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        return None
+    return {'counts': counts.astype('int64').rename('count'), 'preview': preview,
+            'csv': csv_path, 'parquet': parquet_path}
+
+def discard_bulk_results():
+    # Drop this session's last bulk results together with their files on disk
+    bulk_results = st.session_state.pop('bulk_results', None)
+    if bulk_results is not None:
+        shutil.rmtree(os.path.dirname(bulk_results['csv']), ignore_errors=True)
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def result_file_bytes(path, modified_ns):
+    # Read once per scoring run (a rewritten file has a new mtime), not re-serialized on every rerun
+    with open(path, 'rb') as f:
+        return f.read()
+
+def start_background_training(job, retry=False):
+    # A failed run is only resubmitted on retry (the user asked for it), so its error stays visible
+    with job['lock']:
+        future = job['future']
+        if future is None or (retry and future.done() and future.exception() is not None):
+            job['future'] = job['executor'].submit(_train_default_model, job)
+        return job['future']
 
 st.set_page_config(page_title="Loan Approval Predictor", layout="centered")
 st.title("🏦 Loan Approval Predictor")
 
 st.markdown("Upload an Excel file containing loan applicant data:")
 
+signature = artifact_signature()
+if signature is None:
+    job = get_training_job()
+    future = start_background_training(job)
+    if future.done() and future.exception() is not None:
+        st.error(f"Training failed: {future.exception()}")
+        if st.button("Retry training"):
+            start_background_training(job, retry=True)
+            st.rerun()
+        st.stop()
+    else:
+        st.warning("No trained model found. Training model from default dataset in the background...")
+        st.progress(job['progress'], text=job['stage'])
+        time.sleep(0.5)
+        st.rerun()
+
 uploaded_file = st.file_uploader("Choose an Excel file", type=["xlsx", "xls"])
 
+# Each session keeps at most its own last parsed sheet; sessions never evict or pin each other's uploads
+workbook_cache = st.session_state.setdefault('open_workbooks', OrderedDict())
+
 if uploaded_file:
     sheet = st.text_input("Sheet Name", value="Sheet1")
-    index = st.number_input("Row Index (0-based)", min_value=0, value=0)
-    if st.button("Predict Loan Status"):
-        try:
-            columns_to_extract = ['Candidate ID','Basic', 'Conveyance', 'HRA', 'Gross Income',
-                                  'Income from other sources','Bank credit','debit',
-                                  'Years of experiance','Existing loan amount','Assets',
-                                  'Regime','Tax Payble']
-            input_dict = extract_row_as_dict(uploaded_file, sheet, index, columns_to_extract)
-            
-            # Load model pipeline if exists
-            model_file = "trained_model.pkl"
-            if os.path.exists(model_file) and os.path.exists("label_encoder.pkl"):
-                model = joblib.load(model_file)
-                label_encoder = joblib.load("label_encoder.pkl")
+    mode = st.radio("Mode", ["Single row", "Score entire sheet"], horizontal=True)
+    feature_columns = ['Candidate ID','Basic', 'Conveyance', 'HRA', 'Gross Income',
+                       'Income from other sources','Bank credit','debit',
+                       'Years of experiance','Existing loan amount','Assets',
+                       'Regime','Tax Payble']
+
+    if mode == "Single row":
+        index = st.number_input("Row Index (0-based)", min_value=0, value=0)
+        if st.button("Predict Loan Status"):
+            try:
+                input_dict = extract_row_as_dict(uploaded_file, sheet, index, feature_columns, workbook_cache)
+
+                # Model artifacts stay in memory until the files on disk change
+                model, label_encoder = load_model_artifacts(artifact_signature())
+
+                status, reason, _ = predict_and_reason(input_dict, model, label_encoder, feature_columns)
+                st.success(f"Loan Status: {status}")
+                st.info(reason)
+
+            except Exception as e:
+                st.error(f"Error: {e}")
+
+    else:
+        # Results belong to one upload and sheet; a different file or sheet clears them and their files
+        upload_key = (uploaded_file.name, uploaded_file.size, sheet)
+        if st.session_state.get('bulk_results_key') != upload_key:
+            discard_bulk_results()
+            st.session_state['bulk_results_key'] = upload_key
+
+        if st.button("Score Entire Sheet"):
+            try:
+                # The upload is parsed once; scoring runs in fixed-size vectorized batches
+                applicants = open_workbook(uploaded_file, sheet, workbook_cache).df
+                model, label_encoder = load_model_artifacts(artifact_signature())
+                progress = st.progress(0.0, text="Scoring...")
+                discard_bulk_results()
+                st.session_state['bulk_results'] = score_sheet_to_files(applicants, model, label_encoder,
+                                                                        feature_columns, progress)
+            except Exception as e:
+                st.error(f"Error: {e}")
+
+        # Only counts, a preview and file paths live in session state; clicking a download button
+        # reruns the script, and the file bytes come from result_file_bytes's cache
+        bulk_results = st.session_state.get('bulk_results')
+        if bulk_results is not None:
+            st.write(bulk_results['counts'])
+            st.dataframe(bulk_results['preview'])
+            csv_path = bulk_results['csv']
+            st.download_button("Download CSV", result_file_bytes(csv_path, os.stat(csv_path).st_mtime_ns),
+                               file_name="loan_predictions.csv", mime="text/csv")
+            parquet_path = bulk_results['parquet']
+            if parquet_path is not None:
+                st.download_button("Download Parquet",
+                                   result_file_bytes(parquet_path, os.stat(parquet_path).st_mtime_ns),
+                                   file_name="loan_predictions.parquet", mime="application/octet-stream")
             else:
-                st.warning("Training model from default dataset...")
-                df = load_loan_data("D:\\Datasets\\5k_dummy_records.xlsx", "Loan Applicants")
-                X, y_encoded, preprocessor, label_encoder, num_cols, cat_cols, feature_cols = prepare_features(df)
-                model, _, _ = train_model(X, y_encoded, preprocessor)
-                joblib.dump(model, model_file)
-                joblib.dump(label_encoder, "label_encoder.pkl")
-            
-            # Get feature columns for ordering
-            feature_columns = ['Candidate ID','Basic', 'Conveyance', 'HRA', 'Gross Income',
-                               'Income from other sources','Bank credit','debit',
-                               'Years of experiance','Existing loan amount','Assets',
-                               'Regime','Tax Payble']
-
-            status, reason, _ = predict_and_reason(input_dict, model, label_encoder, feature_columns)
-            st.success(f"Loan Status: {status}")
-            st.info(reason)
-
-        except Exception as e:
-            st.error(f"Error: {e}")
+                st.caption("Install pyarrow to enable Parquet download.")
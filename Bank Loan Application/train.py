@@ -1,10 +1,25 @@
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold, ParameterGrid
 from sklearn.pipeline import Pipeline
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.base import clone
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+import os
+import time
+from instrumentation import get_logger, instrumented
 
-def train_model(X, y, preprocessor, random_state=42):
+logger = get_logger('loan.train')
+
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [None, 10, 20],
+    'min_samples_leaf': [1, 5, 20],
+}
+
+@instrumented('train_model', rows=lambda result: result[0].training_info_['windows'][-1]['rows'])
+def train_model(X, y, preprocessor, random_state=42, classifier_params=None, data_window='initial'):
     # Stratified split
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=random_state, stratify=y
@@ -12,23 +27,153 @@ def train_model(X, y, preprocessor, random_state=42):
 
     model = Pipeline([
         ('preprocessor', preprocessor),
-        ('classifier', RandomForestClassifier(random_state=random_state))
+        ('classifier', RandomForestClassifier(random_state=random_state, **(classifier_params or {})))
     ])
 
     model.fit(X_train, y_train)
+    # Versioning and data-window record, extended by update_model on each incremental retrain
+    model.training_info_ = {
+        'version': 1,
+        'windows': [{'window': data_window, 'rows': len(X_train),
+                     'trees': model.named_steps['classifier'].n_estimators}],
+    }
     return model, X_test, y_test
 
+def update_model(model, X_new, y_new, n_new_trees=20, data_window=None, refresh_scaler=True):
+    """Grow a trained pipeline with trees fitted only on newly arrived rows (warm start).
+
+    The StandardScaler statistics are refreshed with partial_fit, and existing split
+    thresholds are rescaled so the old trees keep making the same decisions
+    (up to float32 rounding of values sitting exactly on a split).
+    """
+    preprocessor = model.named_steps['preprocessor']
+    clf = model.named_steps['classifier']
+    y_new = np.asarray(y_new)
+    if not np.array_equal(np.unique(y_new), clf.classes_):
+        raise ValueError(f"New data must contain every class seen in training: {list(clf.classes_)}")
+
+    scaler = preprocessor.named_transformers_.get('num')
+    if refresh_scaler and scaler is not None and scaler.mean_ is not None:
+        num_cols = list(scaler.feature_names_in_)
+        old_mean, old_scale = scaler.mean_.copy(), scaler.scale_.copy()
+        scaler.partial_fit(X_new[num_cols])
+        new_mean, new_scale = scaler.mean_, scaler.scale_
+        # Numeric features come first in the ColumnTransformer output
+        for estimator in clf.estimators_:
+            tree = estimator.tree_
+            numeric = (tree.children_left != -1) & (tree.feature >= 0) & (tree.feature < len(num_cols))
+            f = tree.feature[numeric]
+            raw = tree.threshold[numeric] * old_scale[f] + old_mean[f]
+            tree.threshold[numeric] = (raw - new_mean[f]) / new_scale[f]
+
+    # warm_start keeps the fitted trees and only fits the extra ones, on the new rows
+    clf.set_params(warm_start=True, n_estimators=len(clf.estimators_) + n_new_trees)
+    clf.fit(preprocessor.transform(X_new), y_new)
+    clf.set_params(warm_start=False)
+
+    info = getattr(model, 'training_info_', {'version': 1, 'windows': []})
+    info['version'] += 1
+    info['windows'].append({'window': data_window or f"update-{info['version']}",
+                            'rows': len(X_new), 'trees': n_new_trees})
+    model.training_info_ = info
+    return model
+
+# Preprocessed folds, set once per worker process by _init_tuning_worker
+_tuning_folds = None
+
+def _init_tuning_worker(folds):
+    global _tuning_folds
+    _tuning_folds = folds
+
+def _fit_candidate(task):
+    candidate_id, params, fold_index, n_samples, random_state = task
+    X_train, y_train, X_val, y_val, order = _tuning_folds[fold_index]
+    # Successive-halving rounds train on a growing prefix of a fixed per-fold shuffle
+    rows = order[:n_samples]
+    start = time.perf_counter()
+    clf = RandomForestClassifier(random_state=random_state, n_jobs=1, **params)
+    clf.fit(X_train[rows], y_train[rows])
+    score = accuracy_score(y_val, clf.predict(X_val))
+    return candidate_id, fold_index, score, time.perf_counter() - start
+
+def tune_model(X, y, preprocessor, param_grid=None, n_splits=5, n_jobs=None,
+               successive_halving=True, factor=3, min_samples=None, random_state=42):
+    """Stratified k-fold search over RandomForest parameters across a process pool.
+
+    Returns (best_params, results) where results has one row per candidate and round.
+    """
+    candidates = list(ParameterGrid(param_grid or DEFAULT_PARAM_GRID))
+    y = np.asarray(y)
+
+    # Fit the preprocessor once per fold and reuse the transformed arrays for every candidate
+    rng = np.random.RandomState(random_state)
+    folds = []
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for train_idx, val_idx in skf.split(X, y):
+        fold_preprocessor = clone(preprocessor).fit(X.iloc[train_idx])
+        X_train = fold_preprocessor.transform(X.iloc[train_idx])
+        X_val = fold_preprocessor.transform(X.iloc[val_idx])
+        folds.append((X_train, y[train_idx], X_val, y[val_idx], rng.permutation(len(train_idx))))
+    max_samples = min(len(fold[1]) for fold in folds)
+
+    # Halving schedule: each round keeps the best 1/factor of candidates on factor x more rows
+    if successive_halving and len(candidates) > 1:
+        n_rounds = int(np.ceil(np.log(len(candidates)) / np.log(factor))) + 1
+        if min_samples is None:
+            min_samples = max(max_samples // factor ** (n_rounds - 1), 2 * n_splits)
+    else:
+        n_rounds = 1
+        min_samples = max_samples
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    results = []
+    alive = list(range(len(candidates)))
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_tuning_worker, initargs=(folds,)) as executor:
+        for round_index in range(n_rounds):
+            n_samples = max_samples if round_index == n_rounds - 1 else min(min_samples * factor ** round_index, max_samples)
+            tasks = [(c, candidates[c], f, n_samples, random_state) for c in alive for f in range(n_splits)]
+            scores = {c: [] for c in alive}
+            seconds = {c: 0.0 for c in alive}
+            round_start = time.perf_counter()
+            for candidate_id, _, score, elapsed in executor.map(_fit_candidate, tasks):
+                scores[candidate_id].append(score)
+                seconds[candidate_id] += elapsed
+            logger.info(f"Round {round_index + 1}/{n_rounds}: {len(alive)} candidates on {n_samples} rows "
+                        f"({time.perf_counter() - round_start:.1f} s)")
+
+            for c in alive:
+                results.append({
+                    'round': round_index + 1,
+                    'candidate': c,
+                    **candidates[c],
+                    'n_samples': n_samples,
+                    'mean_accuracy': float(np.mean(scores[c])),
+                    'std_accuracy': float(np.std(scores[c])),
+                    'wall_time_s': seconds[c],
+                })
+            ranked = sorted(alive, key=lambda c: np.mean(scores[c]), reverse=True)
+            if n_samples >= max_samples or len(ranked) == 1:
+                alive = ranked[:1]
+                break
+            alive = ranked[:max(1, int(np.ceil(len(ranked) / factor)))]
+
+    results = pd.DataFrame(results).sort_values(['round', 'mean_accuracy'], ascending=[True, False])
+    best_params = candidates[alive[0]]
+    logger.info(f"\nBest parameters: {best_params}")
+    return best_params, results.reset_index(drop=True)
+
+@instrumented('evaluate_model', rows=lambda result: result[2].sum())
 def evaluate_model(model, X_test, y_test, label_encoder):
     y_pred = model.predict(X_test)
     accuracy = accuracy_score(y_test, y_pred)
     classification_rep = classification_report(y_test, y_pred, target_names=label_encoder.classes_)
     conf_matrix = confusion_matrix(y_test, y_pred)
 
-    print(f"\nModel Accuracy: {accuracy:.4f}")
-    print("\nClassification Report:")
-    print(classification_rep)
-    print("\nConfusion Matrix:")
-    print(conf_matrix)
+    logger.info(f"\nModel Accuracy: {accuracy:.4f}")
+    logger.info("\nClassification Report:")
+    logger.info(classification_rep)
+    logger.info("\nConfusion Matrix:")
+    logger.info(conf_matrix)
 
     return accuracy, classification_rep, conf_matrix
 
@@ -39,9 +184,9 @@ def get_feature_importances(model, numerical_features, categorical_features):
         feature_names = numerical_features + list(ohe_feature_names)
         importances = model.named_steps['classifier'].feature_importances_
         importances_series = pd.Series(importances, index=feature_names).sort_values(ascending=False)
-        print("\nTop 10 Feature Importances:")
-        print(importances_series.head(10))
+        logger.info("\nTop 10 Feature Importances:")
+        logger.info(importances_series.head(10))
         return importances_series
     except Exception as e:
-        print(f"Could not get feature importances: {e}")
+        logger.warning(f"Could not get feature importances: {e}")
         return None
@@ -1,62 +1,205 @@
 import re
+import io
+import string
+import os
+import sys
+import glob
 import json
+import time
+import hashlib
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pypdf import PdfReader
-from collections import defaultdct
-data=defaultdict(dict)
-def parse_payroll_text(text):
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
+from collections import defaultdict
+
+BANK_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Bank Loan Application')
+if 'module_loader' not in sys.modules:
+    # Shared modules are loaded by path through module_loader, which is bootstrapped the same way
+    _spec = importlib.util.spec_from_file_location('module_loader', os.path.join(BANK_APP_DIR, 'module_loader.py'))
+    sys.modules['module_loader'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['module_loader'])
+from module_loader import load_module
+
+# Size-capped cache shared with Bank Loan Application/Data_utils.py
+size_capped_cache = load_module('size_capped_cache')
+
+# Bump whenever parsing output changes; cached text stays valid, cached parse results do not
+PARSER_VERSION = 2
+CACHE_DIR = os.environ.get('PAYSLIP_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'payslips'))
+CACHE_MAX_BYTES = int(os.environ.get('PAYSLIP_CACHE_MAX_BYTES', 512 * 1024 ** 2))
+
+# Patterns are compiled once at import instead of on every line
+EARNINGS_START = re.compile(r'^(Basic Salar:)', re.I)
+DEDUCTIONS_START = re.compile(r'^(Provident Fund)', re.I)
+MONEY_LINE = re.compile(r'(.+?)\s+([\d,]+\.\d{2})$')
+# The lookbehind only lets a name start at the beginning of a letter run. Matches are unchanged
+# (a run that cannot end in "<space><number>" fails from every offset), but the regex no longer
+# retries each offset of long runs such as "Employee Details Payment & Leave Details".
+VALUE_PATTERN = r'\d{1,3}(?:,\d{3})*(?:\.\d{2}|\.\d{1})|\d+\.?\d*'
+NAME_VALUE = re.compile(r'(?<![A-Za-z &])([A-Za-z &]+?)\s(' + VALUE_PATTERN + ')')
+VALUE = re.compile(VALUE_PATTERN)
+NAME_CHARS = string.ascii_letters + ' &'
+# Everything str.splitlines() breaks on; each of these is also matched by \s in NAME_VALUE
+LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+
+def parse_payslip_text(text):
+    """Parse a payslip's text into (payroll, pairs).
+
+    payroll holds the header/earnings/deductions sections of parse_payroll_text, pairs the
+    name/value dict of extract_name_value_pairs. Both come from one pass over the lines. All
+    state is local, so concurrent and repeated calls never share results.
+    """
+    payroll = defaultdict(dict)
+    pairs = {}
     section = 'header'
-    earnings_start = re.compile(r'^(Basic Salar:)', re.I)
-    deductions_start = re.compile(r'^(Provident Fund)', re.I)
-    for line in lines:
-        if earnings_start.match(line):
+    # A name run ending the previous line pairs with a value starting this one when exactly one
+    # line-break character separates them (NAME_VALUE's \s), as a findall over the whole text does
+    previous = None
+    for raw_line in text.splitlines(keepends=True):
+        line = raw_line.rstrip(LINE_BREAKS)
+        # \d is str.isdecimal(); matches end in a value character, so the trailing name run of the
+        # previous line never overlaps one of its own pairs
+        if previous and line[:1].isdecimal():
+            name = previous[len(previous.rstrip(NAME_CHARS)):]
+            if name:
+                pairs[name.strip()] = VALUE.match(line).group()
+        for name, value in NAME_VALUE.findall(line):
+            pairs[name.strip()] = value
+        previous = line if len(raw_line) - len(line) == 1 else None
+
+        line = line.strip()
+        if not line:
+            continue
+        if EARNINGS_START.match(line):
             section = 'earnings'
-        elif deductions_start.match(line):
+        elif DEDUCTIONS_START.match(line):
             section = 'deductions'
-        m_money = re.match(r'(.+?)\s+([\d,]+\.\d{2})$', line)
-        if m_money:
-            label = m_money.group(1).strip()
-            value = float(m_money.group(2).replace(',', ''))
-            data[section][label] = value
-            continue
-        
-        # Split other lines: multiple spaces separate key and value
-        parts = re.split(r'\s{1,}', line, maxsplit=1)
+        # Money lines end in ".dd"; skip the regex for every other line
+        if line[-3:-2] == '.':
+            m_money = MONEY_LINE.match(line)
+            if m_money:
+                label = m_money.group(1).strip()
+                value = float(m_money.group(2).replace(',', ''))
+                payroll[section][label] = value
+                continue
+
+        # Split other lines: whitespace separates key and value
+        parts = line.split(None, 1)
         if len(parts) == 2:
             key, value = parts
-            data['header'][key.strip()] = value.strip()
-    
-    return dict(data)
-if __name__ == '__main__':
-    print("pay slip \n")
-    pdf_path =r"D:\s.pdf"
+            payroll['header'][key] = value.strip()
+
+    return dict(payroll), pairs
+
+def parse_payroll_text(text):
+    return parse_payslip_text(text)[0]
+
+# Fields the eligibility calculation cannot do without; lazy extraction stops once all are found
+REQUIRED_FIELDS = ('Basic Salary', 'Total Deductions', 'Days Paid')
+
+def _page_indexes(page_count, page_range=None):
+    # page_range is a 1-based inclusive (first, last) tuple; last may be None for "to the end"
+    if page_range is None:
+        return range(page_count)
+    first, last = page_range
+    last = page_count if last is None else min(last, page_count)
+    return range(max(first, 1) - 1, last)
+
+def parse_page_range(value):
+    # "2", "1-3" or "2-" as used by the --pages option
+    first, sep, last = value.partition('-')
+    first = int(first)
+    last = (int(last) if last else None) if sep else first
+    if first < 1 or (last is not None and last < first):
+        raise ValueError(f"Invalid page range '{value}'")
+    return first, last
+
+def extract_text(pdf_path, page_range=None):
     reader = PdfReader(pdf_path)
-    text=""
-    for page_num, page in enumerate(reader.pages, start=1):
-        text += page.extract_text()
-    print("prepocessed text")
-    print(text)
-    
+    pages = reader.pages
+    # Collect page texts and join once instead of growing a string page by page
+    return "".join(pages[i].extract_text() or "" for i in _page_indexes(len(pages), page_range)), len(pages)
+
+def iter_page_texts(pdf, page_range=None):
+    """Yield (page_number, text) one page at a time; pages are only decoded when requested.
+
+    pdf is a path, file object or an already open PdfReader.
+    """
+    reader = pdf if isinstance(pdf, PdfReader) else PdfReader(pdf)
+    for i in _page_indexes(len(reader.pages), page_range):
+        yield i + 1, reader.pages[i].extract_text() or ""
+
+def extract_fields_lazy(pdf_path, required=REQUIRED_FIELDS, page_range=None):
+    """Extract pages until every required field has been parsed.
+
+    Returns (text, fields, pages, pages_read). Fields only present on later pages are missed,
+    which is the point: bundles with annexures stop after the payslip page.
+    """
+    reader = PdfReader(pdf_path)
+    page_texts = []
+    fields = {}
+    for _, page_text in iter_page_texts(reader, page_range):
+        page_texts.append(page_text)
+        # Re-parse the joined text so name/value pairs split across a page break still match;
+        # parsing is far cheaper than decoding another page
+        _, fields = parse_payslip_text("".join(page_texts))
+        if all(name in fields for name in required):
+            break
+    return "".join(page_texts), fields, len(reader.pages), len(page_texts)
+
+def _cache_read(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            value = json.load(f)
+        os.utime(path)  # mark as recently used
+        return value
+    except (OSError, ValueError):
+        return None
+
+def _cache_write(path, value, cache_dir, max_bytes):
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+    size_capped_cache.write_entry(path, write, cache_dir, max_bytes)
+
+def extract_and_parse_cached(pdf_path, cache_dir=None, max_bytes=None):
+    """Return (text, pages, fields, cache_hit) using a cache keyed by the PDF content hash.
+
+    cache_hit is 'parsed' (no PDF decoding or parsing), 'text' (parse only) or 'miss'.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    with open(pdf_path, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    text_path = os.path.join(cache_dir, 'text', f"{digest}.json")
+    parsed_path = os.path.join(cache_dir, 'parsed', f"{digest}-v{PARSER_VERSION}.json")
+
+    parsed = _cache_read(parsed_path)
+    if parsed is not None:
+        return None, parsed['pages'], parsed['fields'], 'parsed'
+
+    cached_text = _cache_read(text_path)
+    if cached_text is not None:
+        text, pages, cache_hit = cached_text['text'], cached_text['pages'], 'text'
+    else:
+        text, pages = extract_text(io.BytesIO(content))
+        _cache_write(text_path, {'text': text, 'pages': pages}, cache_dir, max_bytes)
+        cache_hit = 'miss'
+
+    _, fields = parse_payslip_text(text)
+    _cache_write(parsed_path, {'pages': pages, 'fields': fields}, cache_dir, max_bytes)
+    return text, pages, fields, cache_hit
 
-    """payroll = parse_payroll_text(text)
-    t=json.dumps(payroll, indent=1)
-    print(t)"""
-    print("\n")
-print("hash table")
 def extract_name_value_pairs(text):
-    pattern = r'([A-Za-z &]+?)\s(\d{1,3}(?:,\d{3})*(?:\.\d{2}|\.\d{1})|\d+\.?\d*)'
-    matches = re.findall(pattern, text)
+    matches = NAME_VALUE.findall(text)
     output = {}
     for name, value in matches:
         name = name.strip()
         value = value.strip()
         output[name] = value
     return output
-# Hash table
-result = extract_name_value_pairs(text)
-salary_data = result
-for key, value in salary_data.items():
-    print(f"{key}: {value}")
 
 """from tabulate import tabulate
 data = salary_data
@@ -90,10 +233,198 @@ def check_loan_eligibility(net_salary):
     else:
         return "Eligible for loan"
 
-total_earnings = calculate_total_earnings(salary_data)
-net_salary = calculate_net_salary(salary_data)
-eligibility_status = check_loan_eligibility(net_salary)
+def _new_record(pdf_path):
+    return {'file': pdf_path, 'status': 'ok', 'error': None, 'pages': 0, 'pages_read': 0, 'fields': {},
+            'total_earnings': None, 'net_salary': None, 'eligibility': None, 'cache': None,
+            'extract_s': 0.0, 'parse_s': 0.0, 'score_s': 0.0}
+
+def process_payslip(pdf_path, use_cache=False, cache_dir=None, lazy=False, page_range=None):
+    # Extract, parse and score one payslip; errors are returned in the record, never raised
+    record = _new_record(pdf_path)
+    try:
+        if use_cache:
+            # Cached lookups fold extraction and parsing into one timed stage
+            start = time.perf_counter()
+            _, record['pages'], salary_data, record['cache'] = extract_and_parse_cached(pdf_path, cache_dir)
+            record['pages_read'] = record['pages']
+            record['extract_s'] = time.perf_counter() - start
+        elif lazy:
+            # Pages are parsed as they are extracted, so both stages are timed together
+            start = time.perf_counter()
+            _, salary_data, record['pages'], record['pages_read'] = extract_fields_lazy(
+                pdf_path, page_range=page_range)
+            record['extract_s'] = time.perf_counter() - start
+        else:
+            start = time.perf_counter()
+            text, record['pages'] = extract_text(pdf_path, page_range)
+            record['pages_read'] = len(_page_indexes(record['pages'], page_range))
+            record['extract_s'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            _, salary_data = parse_payslip_text(text)
+            record['parse_s'] = time.perf_counter() - start
+        record['fields'] = salary_data
+
+        start = time.perf_counter()
+        record['total_earnings'] = calculate_total_earnings(salary_data)
+        record['net_salary'] = calculate_net_salary(salary_data)
+        record['eligibility'] = check_loan_eligibility(record['net_salary'])
+        record['score_s'] = time.perf_counter() - start
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+    return record
+
+def find_payslips(inputs):
+    # Directories are searched recursively for PDFs; anything else is treated as a glob pattern
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(glob.glob(os.path.join(item, '**', '*.pdf'), recursive=True))
+        else:
+            paths.extend(glob.glob(item, recursive=True))
+    return sorted(set(paths))
+
+class _JsonlSink:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class _ParquetSink:
+    # Records are buffered into small row groups; the variable 'fields' dict is stored as JSON text
+    def __init__(self, path, batch_size=500):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.schema = pa.schema([
+            ('file', pa.string()), ('status', pa.string()), ('error', pa.string()), ('pages', pa.int64()),
+            ('pages_read', pa.int64()), ('fields', pa.string()), ('total_earnings', pa.int64()), ('net_salary', pa.int64()),
+            ('eligibility', pa.string()), ('cache', pa.string()), ('extract_s', pa.float64()), ('parse_s', pa.float64()),
+            ('score_s', pa.float64()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def write(self, record):
+        self.buffer.append(dict(record, fields=json.dumps(record['fields'])))
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.writer.write_table(self.pa.Table.from_pylist(self.buffer, schema=self.schema))
+            self.buffer = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
 
-print(f"Total Earnings:{total_earnings:}")
-print(f"Net Salary:{net_salary:}")
-print(f"Loan Eligibility:{eligibility_status}")
+def ingest_payslips(inputs, output_path, workers=None, use_cache=False, cache_dir=None,
+                    lazy=False, page_range=None):
+    """Process many payslip PDFs in parallel, streaming one result per file to JSONL or Parquet."""
+    if use_cache and (lazy or page_range):
+        # Cache entries hold the whole document's text and fields
+        raise ValueError("The cache cannot be combined with lazy or page-range extraction")
+    paths = find_payslips(inputs)
+    sink = _ParquetSink(output_path) if output_path.endswith('.parquet') else _JsonlSink(output_path)
+    stage_totals = {'extract_s': 0.0, 'parse_s': 0.0, 'score_s': 0.0}
+    page_totals = {'pages': 0, 'pages_read': 0}
+    cache_hits = defaultdict(int)
+    failed = 0
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(process_payslip, path, use_cache, cache_dir, lazy, page_range): path
+                       for path in paths}
+            # Results are written as each file finishes, not in submission order
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # A crashed worker (e.g. BrokenProcessPool) fails its own files, not the whole ingest
+                    record = dict(_new_record(futures[future]), status='error',
+                                  error=f"Worker failed: {type(e).__name__}: {e}")
+                sink.write(record)
+                if record['status'] != 'ok':
+                    failed += 1
+                    print(f"Failed: {record['file']} ({record['error']})", file=sys.stderr)
+                for stage in stage_totals:
+                    stage_totals[stage] += record[stage]
+                for key in page_totals:
+                    page_totals[key] += record[key]
+                if record['cache']:
+                    cache_hits[record['cache']] += 1
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - start
+
+    report = {
+        'files': len(paths),
+        'failed': failed,
+        'seconds': round(elapsed, 3),
+        'files_per_second': round(len(paths) / elapsed, 2) if elapsed > 0 else None,
+        # Mean time per file spent in each stage (inside the worker processes)
+        'stage_mean_s': {stage: round(total / len(paths), 6) if paths else 0.0
+                         for stage, total in stage_totals.items()},
+        'pages': page_totals['pages'],
+        'pages_read': page_totals['pages_read'],
+        'pages_skipped': page_totals['pages'] - page_totals['pages_read'],
+    }
+    if use_cache:
+        report['cache'] = dict(cache_hits)
+    return report
+
+def main():
+    print("pay slip \n")
+    pdf_path =r"D:\s.pdf"
+    text, _ = extract_text(pdf_path)
+    print("prepocessed text")
+    print(text)
+
+
+    """payroll = parse_payroll_text(text)
+    t=json.dumps(payroll, indent=1)
+    print(t)"""
+    print("\n")
+    print("hash table")
+    # Hash table
+    result = extract_name_value_pairs(text)
+    salary_data = result
+    for key, value in salary_data.items():
+        print(f"{key}: {value}")
+
+    total_earnings = calculate_total_earnings(salary_data)
+    net_salary = calculate_net_salary(salary_data)
+    eligibility_status = check_loan_eligibility(net_salary)
+
+    print(f"Total Earnings:{total_earnings:}")
+    print(f"Net Salary:{net_salary:}")
+    print(f"Loan Eligibility:{eligibility_status}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        parser = argparse.ArgumentParser(prog='loan.py batch', description="Batch payslip ingestion")
+        parser.add_argument('inputs', nargs='+', help="directories or glob patterns of PDFs")
+        parser.add_argument('--output', default='payslips.jsonl', help="results file (.jsonl or .parquet)")
+        parser.add_argument('--workers', type=int, default=None)
+        parser.add_argument('--cache', action='store_true', help="reuse text/parse results of identical PDFs")
+        parser.add_argument('--cache-dir', default=None)
+        parser.add_argument('--lazy', action='store_true',
+                            help=f"stop extracting pages once {', '.join(REQUIRED_FIELDS)} are found")
+        parser.add_argument('--pages', type=parse_page_range, default=None,
+                            help="only extract this page range, e.g. 1, 1-2 or 2-")
+        args = parser.parse_args(sys.argv[2:])
+        if args.cache and (args.lazy or args.pages):
+            parser.error("--cache cannot be combined with --lazy or --pages")
+        report = ingest_payslips(args.inputs, args.output, args.workers, args.cache, args.cache_dir,
+                                 args.lazy, args.pages)
+        print(json.dumps(report, indent=2))
+    else:
+        main()
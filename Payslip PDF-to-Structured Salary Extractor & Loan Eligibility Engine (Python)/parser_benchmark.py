@@ -0,0 +1,93 @@
+import argparse
+import random
+import re
+import time
+from collections import defaultdict
+from loan import parse_payslip_text
+
+FIRST_NAMES = ['Mukesh', 'Anita', 'Ravi', 'Priya', 'Suresh', 'Kavya', 'Arjun', 'Meena']
+LAST_NAMES = ['Kumar', 'Sharma', 'Reddy', 'Iyer', 'Singh', 'Gupta', 'Nair', 'Das']
+EARNINGS = ['Basic Salary', 'Conveyance Non Taxable', 'House Rent Allowance', 'Sundry Medical',
+            'Variable Allowance', 'Leave Travel Allowance', 'Personal Allowance', 'Miscellaneous',
+            'Special Allowance']
+DEDUCTIONS = ['Provident Fund', 'Professional Tax', 'Income Tax', 'TCS Welfare Trust']
+
+def _amount(rng, low, high):
+    return f"{rng.randint(low, high) * 50:,.2f}"
+
+def make_payslip_text(rng):
+    # Text in the shape pypdf extracts from the sample payslip (s.pdf), with random values
+    basic = rng.randint(300, 3000)
+    earnings = [(name, _amount(rng, basic // 10, basic) if i else f"{basic * 50:,.2f}")
+                for i, name in enumerate(EARNINGS) if i == 0 or rng.random() < 0.8]
+    deductions = [(name, _amount(rng, 2, 60)) for name in DEDUCTIONS if rng.random() < 0.9]
+    total_earnings = sum(float(v.replace(',', '')) for _, v in earnings)
+    total_deductions = sum(float(v.replace(',', '')) for _, v in deductions)
+
+    lines = [
+        "Salary Slip",
+        f"Mr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES).lower()}",
+        "Employee Details Payment & Leave Details",
+        f"Emp No. {rng.randint(1000, 99999)} Bank Name HDFC Bank Location New Delhi",
+        "Dsgn. Web Designer Acc No. Base Br. Wipro",
+        f"Grade B{rng.randint(1, 5)} Days Paid {rng.randint(20, 31)} Depute Br. Wipro",
+        "PAN Leave Balance EL SL CL WON/SWON",
+        "Earnings Arrears on Current on Deductions Amount",
+    ]
+    # Earnings and deductions share rows, as in the two-column PDF layout
+    for i in range(max(len(earnings), len(deductions))):
+        left = f"{earnings[i][0]} {earnings[i][1]}" if i < len(earnings) else ""
+        right = f"{deductions[i][0]} {deductions[i][1]}" if i < len(deductions) else ""
+        lines.append(f"{left} {right}".strip())
+    lines.append("Total Earnings (Current + Arrears)")
+    lines.append(f"{total_earnings:,.2f} Total Deductions {total_deductions:,.2f}")
+    return "\n".join(lines)
+
+def make_corpus(n, seed=42):
+    rng = random.Random(seed)
+    return [make_payslip_text(rng) for _ in range(n)]
+
+def _legacy_parse(text):
+    # The original parser: uncompiled per-line regexes, then a second pass with findall over
+    # the whole text. Kept as the reference for correctness and speed comparisons
+    data = defaultdict(dict)
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    section = 'header'
+    earnings_start = re.compile(r'^(Basic Salar:)', re.I)
+    deductions_start = re.compile(r'^(Provident Fund)', re.I)
+    for line in lines:
+        if earnings_start.match(line):
+            section = 'earnings'
+        elif deductions_start.match(line):
+            section = 'deductions'
+        m_money = re.match(r'(.+?)\s+([\d,]+\.\d{2})$', line)
+        if m_money:
+            data[section][m_money.group(1).strip()] = float(m_money.group(2).replace(',', ''))
+            continue
+        parts = re.split(r'\s{1,}', line, maxsplit=1)
+        if len(parts) == 2:
+            data['header'][parts[0].strip()] = parts[1].strip()
+    pattern = r'([A-Za-z &]+?)\s(\d{1,3}(?:,\d{3})*(?:\.\d{2}|\.\d{1})|\d+\.?\d*)'
+    pairs = {name.strip(): value.strip() for name, value in re.findall(pattern, text)}
+    return dict(data), pairs
+
+def _docs_per_second(fn, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return len(corpus) / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Payslip text parsing micro-benchmark")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs, args.seed)
+    mismatches = sum(parse_payslip_text(text) != _legacy_parse(text) for text in corpus)
+    print(f"Corpus: {len(corpus)} synthetic payslips ({mismatches} mismatches vs the legacy parser)")
+
+    legacy = _docs_per_second(_legacy_parse, corpus)
+    one_pass = _docs_per_second(parse_payslip_text, corpus)
+    print(f"legacy (uncompiled, two passes): {legacy:10,.0f} docs/s")
+    print(f"parse_payslip_text (one pass):   {one_pass:10,.0f} docs/s ({one_pass / legacy:.2f}x)")
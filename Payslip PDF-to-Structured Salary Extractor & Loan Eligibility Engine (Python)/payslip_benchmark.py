@@ -0,0 +1,97 @@
+import os
+import sys
+import glob
+import json
+import argparse
+import numpy as np
+from loan import process_payslip
+
+def _amount(value):
+    try:
+        return float(str(value).replace(',', ''))
+    except ValueError:
+        return None
+
+def load_corpus(corpus_dir, limit=None):
+    # (pdf path, ground truth) pairs written by synthetic_payslips.py
+    items = []
+    for pdf_path in sorted(glob.glob(os.path.join(corpus_dir, '*.pdf')))[:limit]:
+        with open(os.path.splitext(pdf_path)[0] + '.json', encoding='utf-8') as f:
+            items.append((pdf_path, json.load(f)))
+    if not items:
+        raise FileNotFoundError(f"No payslip PDFs in '{corpus_dir}'; run synthetic_payslips.py first")
+    return items
+
+def benchmark_mode(corpus, lazy=False):
+    """Run extraction, parsing and scoring over the corpus in this process and score the output."""
+    latencies = []
+    field_hits, field_counts = {}, {}
+    exact_docs = net_salary_hits = eligibility_hits = failed = pages = pages_read = 0
+    for pdf_path, truth in corpus:
+        record = process_payslip(pdf_path, lazy=lazy)
+        latencies.append(record['extract_s'] + record['parse_s'] + record['score_s'])
+        pages += record['pages']
+        pages_read += record['pages_read']
+        if record['status'] != 'ok':
+            failed += 1
+
+        all_correct = True
+        for name, expected in truth['fields'].items():
+            correct = _amount(record['fields'].get(name, 'missing')) == _amount(expected)
+            field_counts[name] = field_counts.get(name, 0) + 1
+            field_hits[name] = field_hits.get(name, 0) + correct
+            all_correct &= correct
+        exact_docs += all_correct
+        net_salary_hits += record['net_salary'] == truth['net_salary']
+        eligibility_hits += record['eligibility'] == truth['eligibility']
+
+    latencies_ms = np.array(latencies) * 1000
+    total_s = float(np.sum(latencies))
+    return {
+        'mode': 'lazy' if lazy else 'full',
+        'files': len(corpus),
+        'failed': failed,
+        'files_per_second': round(len(corpus) / total_s, 2),
+        'pages_per_second': round(pages_read / total_s, 2),
+        'pages': pages,
+        'pages_skipped': pages - pages_read,
+        'latency_ms': {f"p{p}": round(float(np.percentile(latencies_ms, p)), 3) for p in (50, 90, 99)},
+        'field_accuracy': {name: round(field_hits[name] / field_counts[name], 4) for name in field_counts},
+        'document_accuracy': round(exact_docs / len(corpus), 4),
+        'net_salary_accuracy': round(net_salary_hits / len(corpus), 4),
+        'eligibility_accuracy': round(eligibility_hits / len(corpus), 4),
+    }
+
+def _print_result(result):
+    print(f"\n[{result['mode']}] {result['files']} files, {result['failed']} failed, "
+          f"{result['pages_skipped']}/{result['pages']} pages skipped")
+    print(f"  throughput: {result['files_per_second']:,.1f} files/s, {result['pages_per_second']:,.1f} pages/s")
+    latency = result['latency_ms']
+    print(f"  latency:    p50 {latency['p50']:.1f} ms, p90 {latency['p90']:.1f} ms, p99 {latency['p99']:.1f} ms")
+    print(f"  accuracy:   documents {result['document_accuracy']:.2%}, "
+          f"net salary {result['net_salary_accuracy']:.2%}, eligibility {result['eligibility_accuracy']:.2%}")
+    for name, accuracy in result['field_accuracy'].items():
+        print(f"    {name:<24} {accuracy:.2%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extraction/parsing benchmark over a synthetic payslip corpus")
+    parser.add_argument('corpus_dir', help="directory written by synthetic_payslips.py")
+    parser.add_argument('--limit', type=int, default=None, help="only use the first N payslips")
+    parser.add_argument('--modes', nargs='+', choices=['full', 'lazy'], default=['full', 'lazy'])
+    parser.add_argument('--output', help="write the results as JSON")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir, args.limit)
+    results = []
+    for mode in args.modes:
+        results.append(benchmark_mode(corpus, lazy=mode == 'lazy'))
+        _print_result(results[-1])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to '{args.output}'")
+
+    # Filler pages carry no pay lines, so reading every page must find what lazy extraction finds
+    keys = ('document_accuracy', 'net_salary_accuracy', 'eligibility_accuracy', 'field_accuracy')
+    if len({json.dumps([result[key] for key in keys]) for result in results}) > 1:
+        sys.exit("\nFull and lazy extraction disagree on accuracy; the filler pages are being parsed as pay lines")
@@ -0,0 +1,333 @@
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from loan import process_payslip, find_payslips, parse_page_range
+
+BANK_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Bank Loan Application')
+if 'module_loader' not in sys.modules:
+    # Shared modules are loaded by path through module_loader, which is bootstrapped the same way
+    _spec = importlib.util.spec_from_file_location('module_loader', os.path.join(BANK_APP_DIR, 'module_loader.py'))
+    sys.modules['module_loader'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['module_loader'])
+from module_loader import load_module
+
+# Applicant columns as generated by Random_data_generation/financial_data_generator.py, in training order
+APPLICANT_COLUMNS = ['Candidate ID', 'Basic', 'Conveyance', 'HRA', 'Gross Income', 'Income from other sources',
+                     'Bank credit', 'debit', 'Years of experiance', 'Existing loan amount', 'Assets', 'Regime',
+                     'Tax Payble']
+# Payslip lines that are not earnings
+DEDUCTION_FIELDS = {'Provident Fund', 'Professional Tax', 'Income Tax', 'TCS Welfare Trust',
+                    'Total Deductions', 'Days Paid'}
+# A payslip says nothing about these; use the --applicants file to supply real values
+DEFAULT_APPLICANT_VALUES = {
+    'Income from other sources': 0,
+    'Years of experiance': 0,
+    'Existing loan amount': 0,
+    'Assets': 0,
+    'Regime': 'New',
+}
+_DONE = object()
+
+def _amount(value):
+    return float(str(value).replace(',', ''))
+
+def payslip_to_applicant(record, overrides=None):
+    """Map one process_payslip record onto the 13-column applicant schema.
+
+    Salary columns come from the payslip; salary credit is taken as the bank credit and the
+    deductions as the debit unless overrides (a dict of applicant columns) says otherwise.
+    Every column stays in the payslip's period (monthly), like the generator's rows, where
+    tax is a share of the same period's Gross Income.
+    """
+    fields = record['fields']
+    basic = _amount(fields['Basic Salary'])
+    earnings = sum(_amount(value) for name, value in fields.items() if name not in DEDUCTION_FIELDS)
+    deductions = _amount(fields.get('Total Deductions', 0))
+    applicant = dict(DEFAULT_APPLICANT_VALUES)
+    applicant.update({
+        'Candidate ID': os.path.splitext(os.path.basename(record['file']))[0],
+        'Basic': basic,
+        'Conveyance': _amount(fields.get('Conveyance Non Taxable', fields.get('Conveyance', 0))),
+        'HRA': _amount(fields.get('House Rent Allowance', 0)),
+        'Gross Income': earnings,
+        'Bank credit': earnings - deductions,
+        'debit': deductions,
+        'Tax Payble': _amount(fields.get('Income Tax', 0)),
+    })
+    if overrides:
+        applicant.update({col: value for col, value in overrides.items() if col in APPLICANT_COLUMNS})
+    return applicant
+
+def load_applicant_overrides(path):
+    # CSV/Excel of extra applicant details keyed by 'Candidate ID' (the payslip file name without .pdf)
+    import pandas as pd
+    df = pd.read_csv(path) if path.endswith('.csv') else pd.read_excel(path)
+    return {str(row['Candidate ID']): row for row in df.to_dict('records')}
+
+class StageMetrics:
+    """Counts items and time spent working, waiting for input and blocked on a full output queue."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy_s = 0.0
+        self.wait_in_s = 0.0
+        self.blocked_s = 0.0
+        self.max_queue_depth = 0
+        self.started = None
+        self.finished = None
+        self.error = None
+
+    def get(self, q):
+        start = time.perf_counter()
+        item = q.get()
+        self.wait_in_s += time.perf_counter() - start
+        return item
+
+    def put(self, q, item):
+        start = time.perf_counter()
+        q.put(item)
+        self.blocked_s += time.perf_counter() - start
+        self.max_queue_depth = max(self.max_queue_depth, q.qsize())
+
+    def report(self):
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        return {
+            'items': self.items,
+            'items_per_second': round(self.items / elapsed, 2) if elapsed > 0 else None,
+            'busy_s': round(self.busy_s, 3),
+            'wait_in_s': round(self.wait_in_s, 3),
+            # Time a stage could not hand results on because the next queue was full
+            'blocked_s': round(self.blocked_s, 3),
+            'max_output_queue_depth': self.max_queue_depth,
+            'error': self.error,
+        }
+
+def _failed_record(path, error):
+    return {'file': path, 'status': 'error', 'error': error}
+
+def _drain(q):
+    # After a stage fails, keep consuming its input so the stage before it never blocks on a full queue
+    while q.get() is not _DONE:
+        pass
+
+def _extract_stage(paths, out_q, metrics, workers, lazy, page_range):
+    metrics.started = time.perf_counter()
+    # Keep every worker fed with a second file queued, but never more than that
+    max_in_flight = workers * 2
+    pending = {}
+
+    def drain():
+        # Hand on whatever has finished; the put blocks while the batcher is behind
+        start = time.perf_counter()
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        metrics.wait_in_s += time.perf_counter() - start
+        for future in done:
+            path = pending.pop(future)
+            try:
+                record = future.result()
+            except Exception as e:
+                # process_payslip never raises, so this is the worker itself dying (BrokenProcessPool)
+                record = _failed_record(path, f"Extraction worker failed: {type(e).__name__}: {e}")
+            metrics.items += 1
+            metrics.put(out_q, record)
+
+    # _DONE is always sent, or the stages after this one (and run_pipeline) would wait forever
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for path in paths:
+                try:
+                    pending[executor.submit(process_payslip, path, False, None, lazy, page_range)] = path
+                except Exception as e:
+                    # A broken pool refuses new work; every remaining file is reported as failed
+                    metrics.items += 1
+                    metrics.put(out_q, _failed_record(path, f"Extraction worker failed: {type(e).__name__}: {e}"))
+                    continue
+                if len(pending) >= max_in_flight:
+                    drain()
+            while pending:
+                drain()
+    except Exception as e:
+        metrics.error = f"{type(e).__name__}: {e}"
+    finally:
+        metrics.put(out_q, _DONE)
+        metrics.finished = time.perf_counter()
+
+def _batch_stage(in_q, out_q, metrics, batch_size, max_wait_s, overrides):
+    metrics.started = time.perf_counter()
+    batch, failed = [], []
+    deadline = None
+    try:
+        while True:
+            try:
+                start = time.perf_counter()
+                timeout = None if deadline is None else max(deadline - start, 0)
+                record = in_q.get(timeout=timeout)
+                metrics.wait_in_s += time.perf_counter() - start
+            except queue.Empty:
+                record = None
+            if record is _DONE:
+                break
+            if record is not None:
+                start = time.perf_counter()
+                if record['status'] == 'ok':
+                    try:
+                        candidate_id = os.path.splitext(os.path.basename(record['file']))[0]
+                        batch.append((record, payslip_to_applicant(record, overrides.get(candidate_id))))
+                    except (KeyError, ValueError) as e:
+                        record = dict(record, status='error', error=f"Cannot map to applicant: {type(e).__name__}: {e}")
+                if record['status'] != 'ok':
+                    failed.append(record)
+                metrics.items += 1
+                metrics.busy_s += time.perf_counter() - start
+                if deadline is None:
+                    deadline = time.perf_counter() + max_wait_s
+            # Flush on a full batch, or when the oldest buffered record has waited max_wait_s
+            if len(batch) >= batch_size or (deadline is not None and time.perf_counter() >= deadline):
+                metrics.put(out_q, (batch, failed))
+                batch, failed = [], []
+                deadline = None
+        if batch or failed:
+            metrics.put(out_q, (batch, failed))
+    except Exception as e:
+        metrics.error = f"{type(e).__name__}: {e}"
+        _drain(in_q)
+    finally:
+        metrics.put(out_q, _DONE)
+        metrics.finished = time.perf_counter()
+
+def score_applicants(applicants, model, label_encoder, feature_columns):
+    # One (status, reason) pair or exception per applicant. If the batch fails, score the applicants
+    # one by one so a single bad one (e.g. a missing value) fails alone, like MicroBatcher._score
+    predict_and_reason_batch = load_module('predictor').predict_and_reason_batch
+    try:
+        statuses, reasons, _ = predict_and_reason_batch(applicants, model, label_encoder, feature_columns)
+        return [(str(status), reason) for status, reason in zip(statuses, reasons)]
+    except Exception as e:
+        if len(applicants) == 1:
+            return [e]
+    return [score_applicants([applicant], model, label_encoder, feature_columns)[0] for applicant in applicants]
+
+def _score_stage(in_q, out_q, metrics, model, label_encoder, feature_columns):
+    metrics.started = time.perf_counter()
+    try:
+        while True:
+            item = metrics.get(in_q)
+            if item is _DONE:
+                break
+            batch, failed = item
+            start = time.perf_counter()
+            results = failed
+            if batch:
+                applicants = [applicant for _, applicant in batch]
+                scores = score_applicants(applicants, model, label_encoder, feature_columns)
+                for (record, applicant), score in zip(batch, scores):
+                    if isinstance(score, Exception):
+                        results.append(dict(record, status='error',
+                                            error=f"Scoring failed: {type(score).__name__}: {score}"))
+                    else:
+                        results.append(dict(record, applicant=applicant, decision=score[0], reason=score[1]))
+            metrics.items += len(batch)
+            metrics.busy_s += time.perf_counter() - start
+            metrics.put(out_q, results)
+    except Exception as e:
+        metrics.error = f"{type(e).__name__}: {e}"
+        _drain(in_q)
+    finally:
+        metrics.put(out_q, _DONE)
+        metrics.finished = time.perf_counter()
+
+def run_pipeline(inputs, output_path, model, label_encoder, feature_columns, workers=None, batch_size=256,
+                 max_wait_ms=200.0, queue_size=4, lazy=True, page_range=None, overrides=None):
+    """Extract payslips, map them to applicants and score them with the trained Pipeline.
+
+    Extraction (a process pool), batching, scoring and writing run concurrently, joined by
+    bounded queues; queue_size is counted in batches. Returns a report with per-stage metrics.
+    """
+    paths = find_payslips(inputs)
+    workers = workers or os.cpu_count()
+    records_q = queue.Queue(maxsize=queue_size * batch_size)
+    batches_q = queue.Queue(maxsize=queue_size)
+    results_q = queue.Queue(maxsize=queue_size)
+    metrics = {name: StageMetrics(name) for name in ('extract', 'batch', 'score', 'write')}
+
+    threads = [
+        threading.Thread(target=_extract_stage, daemon=True,
+                         args=(paths, records_q, metrics['extract'], workers, lazy, page_range)),
+        threading.Thread(target=_batch_stage, daemon=True,
+                         args=(records_q, batches_q, metrics['batch'], batch_size, max_wait_ms / 1000,
+                               overrides or {})),
+        threading.Thread(target=_score_stage, daemon=True,
+                         args=(batches_q, results_q, metrics['score'], model, label_encoder, feature_columns)),
+    ]
+    counts = {'approved': 0, 'rejected': 0, 'failed': 0}
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    writer = metrics['write']
+    writer.started = start
+    with open(output_path, 'w', encoding='utf-8') as f:
+        while True:
+            results = writer.get(results_q)
+            if results is _DONE:
+                break
+            write_start = time.perf_counter()
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+                if result['status'] != 'ok':
+                    counts['failed'] += 1
+                elif result['decision'] == 'Rejected':
+                    counts['rejected'] += 1
+                else:
+                    counts['approved'] += 1
+            f.flush()
+            writer.items += len(results)
+            writer.busy_s += time.perf_counter() - write_start
+    writer.finished = time.perf_counter()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+    errors = [f"{name}: {stage.error}" for name, stage in metrics.items() if stage.error]
+    if errors:
+        raise RuntimeError(f"Pipeline stage failed ({'; '.join(errors)}); '{output_path}' is incomplete")
+    return {
+        'files': len(paths),
+        **counts,
+        'seconds': round(elapsed, 3),
+        'files_per_second': round(len(paths) / elapsed, 2) if elapsed > 0 else None,
+        'stages': {name: stage.report() for name, stage in metrics.items()},
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Payslip PDFs to loan decisions with the trained model")
+    parser.add_argument('inputs', nargs='+', help="directories or glob patterns of PDFs")
+    parser.add_argument('--output', default='decisions.jsonl')
+    parser.add_argument('--model', default=os.path.join(BANK_APP_DIR, 'trained_model.pkl'))
+    parser.add_argument('--encoder', default=os.path.join(BANK_APP_DIR, 'label_encoder.pkl'))
+    parser.add_argument('--applicants', help="CSV/Excel with the non-payslip columns, keyed by Candidate ID")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=200.0)
+    parser.add_argument('--queue-size', type=int, default=4, help="bound of each inter-stage queue, in batches")
+    parser.add_argument('--full', action='store_true', help="extract every page instead of stopping early")
+    parser.add_argument('--pages', type=parse_page_range, default=None)
+    args = parser.parse_args()
+
+    scoring_service = load_module('scoring_service')
+    if not (os.path.exists(args.model) and os.path.exists(args.encoder)):
+        # load_or_train_model imports the training modules by name when it has to train
+        for name in ('Data_utils', 'preproces', 'train'):
+            load_module(name)
+    model, label_encoder, feature_columns = scoring_service.load_or_train_model(args.model, args.encoder)
+    overrides = load_applicant_overrides(args.applicants) if args.applicants else None
+    report = run_pipeline(args.inputs, args.output, model, label_encoder, feature_columns, args.workers,
+                          args.batch_size, args.max_wait_ms, args.queue_size, not args.full, args.pages, overrides)
+    print(json.dumps(report, indent=2))
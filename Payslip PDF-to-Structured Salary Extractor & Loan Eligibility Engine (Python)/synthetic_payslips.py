@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import random
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from loan import calculate_total_earnings, calculate_net_salary, check_loan_eligibility
+from parser_benchmark import FIRST_NAMES, LAST_NAMES
+
+BANK_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Bank Loan Application')
+if 'module_loader' not in sys.modules:
+    # Shared modules are loaded by path through module_loader, which is bootstrapped the same way
+    _spec = importlib.util.spec_from_file_location('module_loader', os.path.join(BANK_APP_DIR, 'module_loader.py'))
+    sys.modules['module_loader'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['module_loader'])
+from module_loader import load_module, GENERATOR_DIR
+
+LAYOUTS = ['two_column', 'stacked', 'ruled']
+# Bank statement and application details a payslip cannot provide
+APPLICANT_ONLY_COLUMNS = ['Income from other sources', 'Bank credit', 'debit', 'Years of experiance',
+                          'Existing loan amount', 'Assets', 'Regime']
+PROFESSIONAL_TAX = 200
+WELFARE_TRUST = 150
+
+def _money(value):
+    return f"{value:,.2f}"
+
+def payslips_from_applicants(df, seed=42):
+    """Turn generated applicant rows into payslip field sets (monthly amounts, whole rupees)."""
+    rng = random.Random(seed)
+    payslips = []
+    columns = zip(df['Candidate ID'], df['Basic'], df['Conveyance'], df['HRA'], df['Gross Income'], df['Tax Payble'])
+    for candidate_id, basic, conveyance, hra, gross_income, tax in columns:
+        basic, conveyance, hra = int(basic), int(conveyance), int(hra)
+        earnings = {
+            'Basic Salary': basic,
+            'Conveyance Non Taxable': conveyance,
+            'House Rent Allowance': hra,
+        }
+        # Whatever Gross Income holds beyond basic, conveyance and HRA is paid as special allowance
+        special = int(gross_income) - basic - conveyance - hra
+        if special > 0:
+            earnings['Special Allowance'] = special
+        deductions = {
+            'Provident Fund': round(basic * 0.12),
+            'Professional Tax': PROFESSIONAL_TAX,
+            # Generator tax is a share of the same period's Gross Income, so it is used as is
+            'Income Tax': int(tax),
+        }
+        if rng.random() < 0.5:
+            deductions['TCS Welfare Trust'] = WELFARE_TRUST
+        payslips.append({
+            'candidate_id': candidate_id,
+            'employee': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'emp_no': rng.randint(1000, 99999),
+            'days_paid': rng.randint(20, 31),
+            'earnings': earnings,
+            'deductions': deductions,
+        })
+    return payslips
+
+def ground_truth(payslip):
+    # Field names and values as extract_name_value_pairs should return them, deductions included
+    # (calculate_net_salary sums every line that is not a total, so they change net salary too)
+    fields = {name: _money(value) for name, value in payslip['earnings'].items()}
+    fields.update((name, _money(value)) for name, value in payslip['deductions'].items())
+    fields['Days Paid'] = str(payslip['days_paid'])
+    fields['Total Deductions'] = _money(sum(payslip['deductions'].values()))
+    total_earnings = calculate_total_earnings(fields)
+    net_salary = calculate_net_salary(fields)
+    return {
+        'fields': fields,
+        'total_earnings': total_earnings,
+        'net_salary': net_salary,
+        'eligibility': check_loan_eligibility(net_salary),
+    }
+
+def _header(c, payslip, y):
+    c.setFont('Helvetica-Bold', 14)
+    c.drawString(40, y, "Salary Slip")
+    c.setFont('Helvetica', 10)
+    c.drawString(40, y - 20, f"Mr. {payslip['employee']}")
+    c.drawString(40, y - 40, "Employee Details Payment & Leave Details")
+    c.drawString(40, y - 55, f"Emp No. {payslip['emp_no']} Bank Name HDFC Bank Location New Delhi")
+    c.drawString(40, y - 70, f"Grade B2 Days Paid {payslip['days_paid']} Depute Br. Wipro")
+    return y - 100
+
+def _draw_two_column(c, payslip, y):
+    # Earnings on the left and deductions on the right of the same rows, like s.pdf
+    earnings = list(payslip['earnings'].items())
+    deductions = list(payslip['deductions'].items())
+    c.drawString(40, y, "Earnings Amount Deductions Amount")
+    for i in range(max(len(earnings), len(deductions))):
+        y -= 15
+        if i < len(earnings):
+            c.drawString(40, y, f"{earnings[i][0]} {_money(earnings[i][1])}")
+        if i < len(deductions):
+            c.drawString(320, y, f"{deductions[i][0]} {_money(deductions[i][1])}")
+    y -= 25
+    c.drawString(40, y, "Total Earnings (Current + Arrears)")
+    c.drawString(40, y - 15, f"{_money(sum(payslip['earnings'].values()))} "
+                             f"Total Deductions {_money(sum(payslip['deductions'].values()))}")
+
+def _draw_stacked(c, payslip, y):
+    # Earnings block followed by a deductions block, amounts right-aligned in one column
+    for title, items in (("Earnings", payslip['earnings']), ("Deductions", payslip['deductions'])):
+        c.setFont('Helvetica-Bold', 10)
+        c.drawString(40, y, title)
+        c.setFont('Helvetica', 10)
+        for name, value in items.items():
+            y -= 15
+            c.drawString(40, y, name)
+            c.drawRightString(300, y, _money(value))
+        y -= 25
+    c.drawString(40, y, "Total Deductions")
+    c.drawRightString(300, y, _money(sum(payslip['deductions'].values())))
+
+def _draw_ruled(c, payslip, y):
+    # Boxed table with grid lines between rows
+    rows = list(payslip['earnings'].items()) + list(payslip['deductions'].items())
+    rows.append(('Total Deductions', sum(payslip['deductions'].values())))
+    c.line(40, y + 12, 400, y + 12)
+    for name, value in rows:
+        c.drawString(45, y, name)
+        c.drawRightString(395, y, _money(value))
+        c.line(40, y - 4, 400, y - 4)
+        y -= 16
+    c.line(40, y + 12, 40, y + 12 + 16 * len(rows))
+    c.line(400, y + 12, 400, y + 12 + 16 * len(rows))
+
+DRAWERS = {'two_column': _draw_two_column, 'stacked': _draw_stacked, 'ruled': _draw_ruled}
+
+def _draw_filler_page(c, title, rng):
+    # Cover letters and annexures: prose without "name amount" pairs, like real payslip bundles.
+    # Titles carry no page number either, since "Annexure 2" would parse as a pay line
+    c.setFont('Helvetica-Bold', 12)
+    c.drawString(40, 800, title)
+    c.setFont('Helvetica', 9)
+    words = ['policy', 'employee', 'salary', 'annexure', 'benefit', 'statutory', 'compliance',
+             'payroll', 'records', 'leave', 'reimbursement', 'declaration']
+    for i in range(45):
+        c.drawString(40, 770 - i * 16, " ".join(rng.choice(words) for _ in range(12)) + ".")
+    c.showPage()
+
+def render_payslip_pdf(payslip, path, layout='two_column', cover_pages=0, annex_pages=0, seed=0):
+    from reportlab.pdfgen import canvas
+    rng = random.Random(seed)
+    c = canvas.Canvas(path)
+    for _ in range(cover_pages):
+        _draw_filler_page(c, "Cover Letter", rng)
+    c.setFont('Helvetica', 10)
+    DRAWERS[layout](c, payslip, _header(c, payslip, 800))
+    c.showPage()
+    for _ in range(annex_pages):
+        _draw_filler_page(c, "Annexure", rng)
+    c.save()
+
+def _render_one(args):
+    payslip, pdf_path, layout, cover_pages, annex_pages, seed = args
+    render_payslip_pdf(payslip, pdf_path, layout, cover_pages, annex_pages, seed)
+    truth = ground_truth(payslip)
+    truth.update({'file': os.path.basename(pdf_path), 'layout': layout,
+                  'pages': cover_pages + 1 + annex_pages, 'payslip_page': cover_pages + 1})
+    with open(os.path.splitext(pdf_path)[0] + '.json', 'w', encoding='utf-8') as f:
+        json.dump(truth, f, indent=1)
+    return pdf_path
+
+def generate_corpus(output_dir, num_payslips=1000, seed=42, max_annex_pages=4, cover_probability=0.1,
+                    workers=None):
+    """Render num_payslips PDFs, each with a ground-truth JSON next to it, plus applicants.csv.
+
+    Salaries come from generate_financial_data in Random_data_generation/financial_data_generator.py; layouts,
+    cover pages and annexure page counts vary per document but are fixed by seed.
+    """
+    import numpy as np
+    generator = load_module('financial_data_generator', GENERATOR_DIR)
+    df = generator.generate_financial_data(num_payslips, rng=np.random.default_rng(seed))
+    payslips = payslips_from_applicants(df, seed)
+
+    os.makedirs(output_dir, exist_ok=True)
+    # Keyed like payslip_pipeline.py keys its applicants (payslip file name without .pdf)
+    applicants = df[APPLICANT_ONLY_COLUMNS].copy()
+    applicants.insert(0, 'Candidate ID', [f"payslip_{i + 1:05d}" for i in range(len(df))])
+    applicants.to_csv(os.path.join(output_dir, 'applicants.csv'), index=False)
+    rng = random.Random(seed)
+    jobs = []
+    for i, payslip in enumerate(payslips):
+        pdf_path = os.path.join(output_dir, f"payslip_{i + 1:05d}.pdf")
+        cover_pages = 1 if rng.random() < cover_probability else 0
+        jobs.append((payslip, pdf_path, rng.choice(LAYOUTS), cover_pages,
+                     rng.randint(0, max_annex_pages), seed + i))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for done, _ in enumerate(executor.map(_render_one, jobs, chunksize=16), 1):
+            if done % 500 == 0:
+                print(f"Rendered {done}/{num_payslips} payslips")
+    return [job[1] for job in jobs]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a synthetic payslip PDF corpus with ground truth")
+    parser.add_argument('output_dir')
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-annex-pages', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    try:
+        paths = generate_corpus(args.output_dir, args.count, args.seed, args.max_annex_pages, workers=args.workers)
+    except ImportError as e:
+        sys.exit(f"reportlab is required to render payslips ({e})")
+    print(f"Wrote {len(paths)} payslips to '{args.output_dir}'")
@@ -0,0 +1,55 @@
+import os
+import json
+import numpy as np
+import pytest
+from loan import process_payslip
+from payslip_pipeline import APPLICANT_COLUMNS, payslip_to_applicant, score_applicants
+
+SAMPLE_PAYSLIP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 's.pdf')
+
+class ApproveAll:
+    # Stands in for the trained Pipeline and its LabelEncoder
+    def predict(self, df):
+        return np.zeros(len(df), dtype=int)
+
+    def inverse_transform(self, encoded):
+        return np.array(['Approved'] * len(encoded))
+
+def test_sample_payslip_maps_to_one_period():
+    applicant = payslip_to_applicant(process_payslip(SAMPLE_PAYSLIP))
+    assert applicant['Candidate ID'] == 's'
+    assert applicant['Basic'] == 21000
+    assert applicant['Conveyance'] == 1200
+    assert applicant['HRA'] == 4500
+    assert applicant['Gross Income'] == 59950
+    assert applicant['debit'] == 4800
+    assert applicant['Bank credit'] == 55150
+    # The payslip's monthly income tax, not annualised against a monthly Gross Income
+    assert applicant['Tax Payble'] == 2300
+    assert 0 < applicant['Tax Payble'] <= 0.25 * applicant['Gross Income']
+
+def test_overrides_replace_defaults():
+    record = process_payslip(SAMPLE_PAYSLIP)
+    applicant = payslip_to_applicant(record, {'Assets': 250000, 'Regime': 'Old', 'Unknown column': 1})
+    assert applicant['Assets'] == 250000
+    assert applicant['Regime'] == 'Old'
+    assert 'Unknown column' not in applicant
+
+def test_one_bad_applicant_fails_alone():
+    applicant = payslip_to_applicant(process_payslip(SAMPLE_PAYSLIP))
+    applicants = [dict(applicant, Assets=float('nan')) if i == 2 else dict(applicant) for i in range(5)]
+    scores = score_applicants(applicants, ApproveAll(), ApproveAll(), APPLICANT_COLUMNS)
+    assert len(scores) == 5
+    assert isinstance(scores[2], ValueError) and 'Assets' in str(scores[2])
+    assert all(score[0] == 'Approved' for i, score in enumerate(scores) if i != 2)
+
+def test_filler_pages_do_not_change_parsed_salary(tmp_path):
+    pytest.importorskip('reportlab')
+    from synthetic_payslips import generate_corpus
+    paths = generate_corpus(str(tmp_path), 6, seed=3, max_annex_pages=2, cover_probability=0.5, workers=1)
+    for path in paths:
+        with open(os.path.splitext(path)[0] + '.json', encoding='utf-8') as f:
+            truth = json.load(f)
+        full, lazy = process_payslip(path), process_payslip(path, lazy=True)
+        assert full['fields'] == lazy['fields']
+        assert full['net_salary'] == lazy['net_salary'] == truth['net_salary']
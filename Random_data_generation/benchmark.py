@@ -0,0 +1,36 @@
+import json
+import sys
+import time
+
+import numpy as np
+
+from financial_data_generator import generate_financial_data
+
+# Record sizes used for the generator throughput benchmark
+BENCHMARK_SIZES = [5_000, 500_000, 5_000_000]
+
+def benchmark_generation(sizes=BENCHMARK_SIZES, seed=42):
+    results = []
+    for num_records in sizes:
+        np.random.seed(seed)
+        start = time.perf_counter()
+        generate_financial_data(num_records=num_records)
+        elapsed = time.perf_counter() - start
+        rows_per_second = num_records / elapsed if elapsed > 0 else float('inf')
+        results.append({
+            'num_records': num_records,
+            'seconds': round(elapsed, 4),
+            'rows_per_second': round(rows_per_second, 1),
+        })
+        print(f"{num_records:>10,d} records: {elapsed:8.2f} s  ({rows_per_second:,.0f} rows/s)")
+    return results
+
+if __name__ == '__main__':
+    # Usage: python benchmark.py [output.json] [size ...]
+    output_file = sys.argv[1] if len(sys.argv) > 1 else None
+    sizes = [int(arg) for arg in sys.argv[2:]] or BENCHMARK_SIZES
+    results = benchmark_generation(sizes)
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to '{output_file}'")
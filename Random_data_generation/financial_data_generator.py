@@ -0,0 +1,280 @@
+import pandas as pd
+import numpy as np
+import os # Import the os module to handle directory creation
+import sys
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+BANK_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Bank Loan Application')
+if 'module_loader' not in sys.modules:
+    # Shared modules are loaded by path through module_loader, which is bootstrapped the same way
+    _spec = importlib.util.spec_from_file_location('module_loader', os.path.join(BANK_APP_DIR, 'module_loader.py'))
+    sys.modules['module_loader'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['module_loader'])
+from module_loader import load_module
+
+rule_engine = load_module('rule_engine')
+compact_applicant_frame = load_module('applicant_schema').compact_applicant_frame
+
+# Rows drawn from each seed in the chunked generator. Every block gets its own
+# Generator spawned from the base seed, so chunk size never changes the data.
+SEED_BLOCK_SIZE = 10_000
+
+# Set a seed for reproducibility
+np.random.seed(42)
+
+# Reason rules and their thresholds live in Bank Loan Application/rule_engine.py, shared with
+# predictor.py; set LOAN_RULES_FILE to a JSON file to change thresholds without editing code
+GENERATOR_RULES = rule_engine.GENERATOR_RULES
+
+def render_reasons(df, rules=None):
+    """Rebuild the 'Reason for approval or rejected' text from a compact frame's 'Reason code'."""
+    if rules is None:
+        rules = GENERATOR_RULES
+    rejected = (df['Loan Approved status'] == 'Rejected').to_numpy()
+    reason_text = rules.render_df(df, df['Reason code'].to_numpy(), rejected)
+    text = rule_engine.applicant_reason_text(df['Candidate ID'].to_numpy(dtype=object), reason_text, rejected)
+    return pd.Series(text, index=df.index, name='Reason for approval or rejected')
+
+def generate_financial_data(num_records=100, rng=None, id_offset=0, compact=False, rules=None):
+    # Draws come from the global np.random state unless a numpy Generator is passed in;
+    # reasons follow GENERATOR_RULES unless another rule_engine.RuleSet is passed in
+    if rules is None:
+        rules = GENERATOR_RULES
+    if rng is None:
+        rng = np.random
+    randint = rng.integers if isinstance(rng, np.random.Generator) else rng.randint
+
+    data = {}
+
+    # Candidate ID - unique identifier for each record
+    # Generates IDs like 'CAND0001', 'CAND0002', up to 'CAND5000' for 5000 records
+    # (id_offset shifts the numbering when generating a slice of a larger dataset)
+    data['Candidate ID'] = [f'CAND{id_offset+i+1:04d}' for i in range(num_records)]
+
+    # Basic Salary - realistic range (minimum 50,000)
+    data['Basic'] = randint(50000, 150000, num_records)
+
+    # Conveyance - typically a percentage of basic or fixed
+    data['Conveyance'] = np.round(data['Basic'] * rng.uniform(0.05, 0.1), 0)
+
+    # HRA (House Rent Allowance) - typically 40-50% of basic in non-metros, higher in metros
+    data['HRA'] = np.round(data['Basic'] * rng.uniform(0.3, 0.5), 0)
+
+    # Gross Income calculation (initial estimate)
+    # Adds a small random component to make it less directly dependent on Basic, Conveyance, HRA
+    data['Gross Income'] = data['Basic'] + data['Conveyance'] + data['HRA'] + randint(0, 15000, num_records)
+
+    # Income from other sources (e.g., freelance, interest)
+    other_income_values = rng.uniform(0, 50000, num_records)
+    # 40% of records will have zero 'Income from other sources' for diversity
+    zero_mask = rng.choice([True, False], size=num_records, p=[0.4, 0.6])
+    data['Income from other sources'] = np.where(zero_mask, 0, np.round(other_income_values, 0))
+
+    # Total Income (Gross Income + Income from other sources)
+    total_income = data['Gross Income'] + data['Income from other sources']
+
+    # Bank Credit (Total income should roughly align with bank credits + a small buffer)
+    # Simulates bank deposits slightly higher than total income
+    data['Bank credit'] = total_income + randint(1000, 5000, num_records)
+
+    # Debit - expenses, EMIs, etc.
+    data['debit'] = np.round(total_income * rng.uniform(0.3, 0.8), 0)
+    # Ensures debit does not exceed total income (adjusted to 90% of total income if it does)
+    data['debit'][data['debit'] >= total_income] = total_income[data['debit'] >= total_income] * 0.9
+
+    # Years of Experience
+    data['Years of experiance'] = randint(0, 20, num_records)
+
+    # Existing loan amount - some people won't have loans
+    existing_loan_values = rng.uniform(0, 1500000, num_records)
+    # 50% of records will have zero 'Existing loan amount'
+    zero_loan_mask = rng.choice([True, False], size=num_records, p=[0.5, 0.5])
+    data['Existing loan amount'] = np.where(zero_loan_mask, 0, np.round(existing_loan_values, 0))
+
+    # Assets - New column for liquid/fixed assets
+    asset_values = rng.uniform(10000, 5000000, num_records) # Range from 10K to 5M
+    # 30% will have lower/zero assets for diversity
+    low_asset_mask = rng.choice([True, False], size=num_records, p=[0.3, 0.7])
+    data['Assets'] = np.where(low_asset_mask, rng.uniform(0, 100000, num_records), np.round(asset_values, 0))
+    data['Assets'] = np.round(data['Assets'], 0) # Round to nearest whole number
+
+    # Regime (Old or New Tax Regime)
+    data['Regime'] = rng.choice(['Old', 'New'], num_records)
+
+    # Tax Payable - simplified calculation based on regime
+    tax_factor_old = rng.uniform(0.05, 0.2)
+    tax_factor_new = rng.uniform(0.1, 0.25)
+    data['Tax Payble'] = np.where(
+        data['Regime'] == 'Old',
+        np.round(data['Gross Income'] * tax_factor_old, 0),
+        np.round(data['Gross Income'] * tax_factor_new, 0)
+    )
+    data['Tax Payble'][data['Tax Payble'] < 0] = 0 # Ensure tax payable is not negative
+
+    df = pd.DataFrame(data)
+
+    # Loan Approval Logic: any rejection rule rejects; approval rules only explain approved rows
+    masks, values = rules.evaluate(df)
+    rejected = rules.any_fired(masks, 'reject')
+    df['Loan Approved status'] = np.where(rejected, 'Rejected', 'Approved').astype(object)
+    codes = rules.reason_codes(masks, rejected)
+
+    if compact:
+        # Store which rule messages apply as a bitmask instead of the formatted sentence
+        df['Reason code'] = codes
+        return compact_applicant_frame(df)
+
+    reason_text = rules.render(codes, values, rejected)
+
+    # --- DETERMINE APPROVAL STATUS AND REASON ---
+    df['Reason for approval or rejected'] = rule_engine.applicant_reason_text(
+        df['Candidate ID'].to_numpy(dtype=object), reason_text, rejected)
+
+    return df
+
+def generate_financial_data_chunks(num_records, chunk_size=100_000, seed=42, compact=False):
+    # Yield the dataset in chunks of chunk_size rows without holding it all in memory
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    seed_seq = np.random.SeedSequence(seed)
+    # Rows left over from earlier blocks that did not fill a whole chunk yet
+    carry = []
+    carried = 0
+    emitted = 0
+
+    def emit(parts):
+        nonlocal emitted
+        chunk = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].reset_index(drop=True)
+        chunk.index = chunk.index + emitted
+        emitted += len(chunk)
+        return chunk
+
+    for block_start in range(0, num_records, SEED_BLOCK_SIZE):
+        block_index = block_start // SEED_BLOCK_SIZE
+        block_rng = np.random.default_rng(
+            np.random.SeedSequence(seed_seq.entropy, spawn_key=(block_index,))
+        )
+        block_rows = min(SEED_BLOCK_SIZE, num_records - block_start)
+        block = generate_financial_data(block_rows, rng=block_rng, id_offset=block_start, compact=compact)
+
+        # Each block is built once and sliced by offset, so no row is copied more than once
+        offset = 0
+        if carry and carried + block_rows >= chunk_size:
+            offset = chunk_size - carried
+            yield emit(carry + [block.iloc[:offset]])
+            carry, carried = [], 0
+        while block_rows - offset >= chunk_size:
+            yield emit([block.iloc[offset:offset + chunk_size]])
+            offset += chunk_size
+        if offset < block_rows:
+            carry.append(block.iloc[offset:])
+            carried += block_rows - offset
+    if carry:
+        yield emit(carry)
+
+def write_financial_data(output_path, num_records, chunk_size=100_000, seed=42, file_format=None, compact=False):
+    # Stream generated chunks to a Parquet or CSV file; peak memory depends on chunk_size only
+    if file_format is None:
+        file_format = os.path.splitext(output_path)[1].lstrip('.').lower()
+    if file_format not in ('parquet', 'csv'):
+        raise ValueError(f"Unsupported output format: '{file_format}' (use 'parquet' or 'csv')")
+
+    output_directory = os.path.dirname(output_path)
+    if output_directory and not os.path.exists(output_directory):
+        os.makedirs(output_directory)
+
+    chunks = generate_financial_data_chunks(num_records, chunk_size=chunk_size, seed=seed, compact=compact)
+    written = 0
+    if file_format == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing Parquet requires pyarrow: pip install pyarrow") from e
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+                written += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for chunk in chunks:
+            chunk.to_csv(output_path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+            written += len(chunk)
+
+    print(f"Data successfully saved to '{output_path}' with {written} records.")
+    return written
+
+def _generate_shard(args):
+    num_records, seed_seq, id_offset, compact = args
+    return generate_financial_data(num_records, rng=np.random.default_rng(seed_seq), id_offset=id_offset, compact=compact)
+
+def generate_financial_data_parallel(num_records, workers=None, seed=42, compact=False):
+    # Split generation across a process pool. Each shard draws from its own Generator
+    # spawned from one SeedSequence, so the result depends only on seed and workers.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, num_records)) if num_records > 0 else 1
+
+    shard_sizes = [len(part) for part in np.array_split(np.arange(num_records), workers)]
+    shard_offsets = np.concatenate([[0], np.cumsum(shard_sizes)[:-1]]).astype(int)
+    shard_seeds = np.random.SeedSequence(seed).spawn(workers)
+    tasks = [(size, seed_seq, offset, compact) for size, seed_seq, offset in zip(shard_sizes, shard_seeds, shard_offsets.tolist())]
+
+    if workers == 1:
+        shards = [_generate_shard(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map keeps shard order, so Candidate IDs stay contiguous after concat
+            shards = list(executor.map(_generate_shard, tasks))
+
+    return pd.concat(shards, ignore_index=True)
+
+if __name__ == '__main__':
+    # Generate 5000 records
+    df = generate_financial_data(num_records=5000)
+
+    # Define the full path for the Excel file
+    excel_file_name = r'D:\\Datasets\\5k_dummy_records.xlsx' # Raw string to handle backslashes
+
+    # Ensure the directory exists before saving the file
+    output_directory = os.path.dirname(excel_file_name)
+    if not os.path.exists(output_directory):
+        os.makedirs(output_directory)
+        print(f"Created directory: {output_directory}")
+
+    # Save the DataFrame to an Excel file
+    df.to_excel(excel_file_name, index=False, sheet_name='Loan Applicants')
+
+    print(f"\nData successfully saved to '{excel_file_name}' with 5000 records.")
+
+    # Display the first few rows of the DataFrame (including the new Assets column)
+    print("First 5 rows of the generated DataFrame:")
+    print(df.head())
+
+    # Display some statistics to check the data distribution
+    print("\nDataFrame Info:")
+    df.info()
+
+    print("\nDescriptive Statistics:")
+    print(df.describe())
+
+    print("\nValue Counts for Loan Approved Status:")
+    print(df['Loan Approved status'].value_counts())
+
+    # Compare against the compact representation (downcast numerics, categoricals, reason codes)
+    np.random.seed(42)
+    compact_df = generate_financial_data(num_records=5000, compact=True)
+    full_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+    compact_mb = compact_df.memory_usage(deep=True).sum() / 1024 ** 2
+    print(f"\nMemory usage: {full_mb:.2f} MB full, {compact_mb:.2f} MB compact ({full_mb / compact_mb:.1f}x smaller)")
+
+    print("\nSample Reasons for Approval/Rejection (with Candidate ID):")
+    # Display 10 random samples from the larger dataset
+    print(df[['Candidate ID', 'Loan Approved status', 'Reason for approval or rejected']].sample(10))